@@ -6,164 +6,361 @@ Campeonato Brasileiro 2025
 """
 
 from http.server import BaseHTTPRequestHandler
+from datetime import datetime
+from email.utils import formatdate
+import hashlib
 import json
 import os
+import threading
+import time
+import unicodedata
+import urllib.parse
 from pathlib import Path
 
-class handler(BaseHTTPRequestHandler):
-    def do_GET(self):
-        # Log do path recebido
-        print(f"=== API REQUEST ===")
-        print(f"Path recebido: '{self.path}'")
-        print(f"Tipo do path: {type(self.path)}")
-        
-        # Configurar headers CORS
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        self.end_headers()
-        
-        # Rota para dados da Série A
-        if self.path.startswith('/api/serie-a'):
-            try:
-                print(f"=== API Série A chamada ===")
-                print(f"Path: {self.path}")
-                print(f"Current directory: {os.getcwd()}")
-                
-                # Tentar diferentes caminhos para encontrar o arquivo
-                possible_paths = [
-                    '/var/task/data/web_serie_a.json',  # Vercel Lambda path
-                    'data/web_serie_a.json',            # Relative path
-                    os.path.join(os.getcwd(), 'data', 'web_serie_a.json')  # Absolute path
-                ]
-                
-                print(f"Tentando caminhos: {possible_paths}")
-                
-                data = None
-                for path in possible_paths:
-                    try:
-                        print(f"Tentando abrir: {path}")
-                        with open(path, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                        print(f"✅ Sucesso ao carregar: {path}")
-                        break
-                    except FileNotFoundError as e:
-                        print(f"❌ Arquivo não encontrado: {path}")
-                        continue
-                    except Exception as e:
-                        print(f"❌ Erro ao abrir {path}: {e}")
-                        continue
-                
-                if data:
-                    print(f"✅ Dados carregados com sucesso para Série A")
-                    self.wfile.write(json.dumps(data).encode())
-                else:
-                    print(f"❌ Nenhum dado encontrado para Série A")
-                    self.wfile.write(json.dumps({'error': 'Dados da Série A não encontrados em nenhum caminho'}).encode())
-            except Exception as e:
-                print(f"❌ Erro geral na API Série A: {e}")
-                self.wfile.write(json.dumps({'error': str(e)}).encode())
-        
-        # Rota para dados da Série B
-        elif self.path.startswith('/api/serie-b'):
-            try:
-                print(f"=== API Série B chamada ===")
-                print(f"Path: {self.path}")
-                print(f"Current directory: {os.getcwd()}")
-                
-                # Tentar diferentes caminhos para encontrar o arquivo
-                possible_paths = [
-                    '/var/task/data/web_serie_b.json',  # Vercel Lambda path
-                    'data/web_serie_b.json',            # Relative path
-                    os.path.join(os.getcwd(), 'data', 'web_serie_b.json')  # Absolute path
-                ]
-                
-                print(f"Tentando caminhos: {possible_paths}")
-                
-                data = None
-                for path in possible_paths:
-                    try:
-                        print(f"Tentando abrir: {path}")
-                        with open(path, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                        print(f"✅ Sucesso ao carregar: {path}")
-                        break
-                    except FileNotFoundError as e:
-                        print(f"❌ Arquivo não encontrado: {path}")
-                        continue
-                    except Exception as e:
-                        print(f"❌ Erro ao abrir {path}: {e}")
-                        continue
-                
-                if data:
-                    print(f"✅ Dados carregados com sucesso para Série B")
-                    self.wfile.write(json.dumps(data).encode())
-                else:
-                    print(f"❌ Nenhum dado encontrado para Série B")
-                    self.wfile.write(json.dumps({'error': 'Dados da Série B não encontrados em nenhum caminho'}).encode())
-            except Exception as e:
-                print(f"❌ Erro geral na API Série B: {e}")
-                self.wfile.write(json.dumps({'error': str(e)}).encode())
+# Onde o pipeline grava os artefatos (o primeiro que existir é usado pelo processo todo)
+CANDIDATOS_DADOS = [
+    Path('/var/task/data'),                           # Vercel Lambda path
+    Path(__file__).resolve().parent.parent / 'data',  # Raiz do projeto
+    Path.cwd() / 'data',                              # Diretório atual
+]
+
+SERIES = {
+    'serie-a': 'serie_a', 'serie_a': 'serie_a',
+    'serie-b': 'serie_b', 'serie_b': 'serie_b',
+}
+
+# Cache na CDN: ~10% da idade dos dados (heurística do RFC 9111), dentro destes limites
+S_MAXAGE_MINIMO = 60
+S_MAXAGE_MAXIMO = 3600
+STALE_WHILE_REVALIDATE = 3600
+
+CABECALHOS_CORS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type',
+}
+
+# /api/metrics (formato texto do Prometheus)
+BUCKETS_LATENCIA = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+CONTENT_TYPE_METRICAS = 'text/plain; version=0.0.4; charset=utf-8'
+
+_diretorio_dados = None
+_payloads = {}  # arquivo -> (mtime_ns, tamanho, fatias, ultima_atualizacao); fatias: chave -> (corpo, cabeçalhos)
+_payloads_lock = threading.Lock()
+
+# Requisições atendidas por este processo: (rota, status) -> total; rota -> [contagens por bucket, soma, total]
+_requisicoes = {}
+_latencias = {}
+_metricas_lock = threading.Lock()
+
+def diretorio_dados():
+    """Resolve uma única vez por processo o diretório de dados"""
+    global _diretorio_dados
+    if _diretorio_dados is None:
+        _diretorio_dados = next((d for d in CANDIDATOS_DADOS if d.is_dir()), CANDIDATOS_DADOS[-1])
+    return _diretorio_dados
+
+def cache_control(ultima_atualizacao):
+    """Cache-Control para a CDN derivado de `ultima_atualizacao` dos dados"""
+    try:
+        idade = (datetime.now() - datetime.fromisoformat(ultima_atualizacao)).total_seconds()
+    except (TypeError, ValueError):
+        idade = 0
+    s_maxage = int(min(max(idade / 10, S_MAXAGE_MINIMO), S_MAXAGE_MAXIMO))
+    return f'public, max-age=0, s-maxage={s_maxage}, stale-while-revalidate={STALE_WHILE_REVALIDATE}'
+
+def serializar(dados):
+    """JSON compacto em bytes"""
+    return json.dumps(dados, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def normalizar_nome(nome):
+    """Nome de time comparável na URL: sem acentos, minúsculo, '-'/'_' viram espaço"""
+    sem_acentos = unicodedata.normalize('NFKD', nome).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(sem_acentos.replace('-', ' ').replace('_', ' ').lower().split())
+
+def fatiar_indices(indices):
+    """Fatias servidas pelas rotas /team, /probabilities e /round"""
+    fatias = {('probabilities', None): indices['probabilidades']}
+    for zona, lista in indices['probabilidades'].items():
+        fatias[('probabilities', zona)] = {'zona': zona, 'probabilidades': lista}
+    for nome, dados_time in indices['times'].items():
+        fatias[('team', normalizar_nome(nome))] = dados_time
+    for rodada, jogos in indices['rodadas'].items():
+        fatias[('round', rodada)] = {'rodada': int(rodada), 'jogos': jogos}
+    if ('round', str(indices.get('proxima_rodada'))) in fatias:
+        fatias[('round', 'proxima')] = fatias[('round', str(indices['proxima_rodada']))]
+    for fatia in fatias.values():
+        if isinstance(fatia, dict):
+            fatia.setdefault('ultima_atualizacao', indices.get('ultima_atualizacao'))
+    return fatias
+
+def carregar_payload(nome_arquivo, chave=None, fatiar=None):
+    """Corpo serializado e cabeçalhos de um artefato (ou de uma fatia dele)
+    
+    Tudo é refeito só quando o mtime/tamanho do arquivo muda. Retorna None se o
+    arquivo ou a fatia não existir.
+    """
+    arquivo = diretorio_dados() / nome_arquivo
+    try:
+        fs = arquivo.stat()
+    except OSError:
+        return None
+    
+    with _payloads_lock:
+        atual = _payloads.get(nome_arquivo)
+    if not (atual and atual[0] == fs.st_mtime_ns and atual[1] == fs.st_size):
+        atual = ler_payload(arquivo, fs, fatiar)
+        with _payloads_lock:
+            _payloads[nome_arquivo] = atual
+    
+    _, _, fatias, ultima_atualizacao = atual
+    if chave not in fatias:
+        return None
+    # Cache-Control recalculado a cada resposta: a idade dos dados cresce
+    corpo, cabecalhos = fatias[chave]
+    return corpo, {**cabecalhos, 'Cache-Control': cache_control(ultima_atualizacao)}
+
+def ler_payload(arquivo, fs, fatiar=None):
+    """Lê e serializa um artefato (ou cada uma de suas fatias) uma única vez por versão do arquivo"""
+    with open(arquivo, 'r', encoding='utf-8') as f:
+        dados = json.load(f)
+    
+    fatias = {}
+    for chave, fatia in (fatiar(dados) if fatiar else {None: dados}).items():
+        corpo = serializar(fatia)
+        fatias[chave] = (corpo, {
+            'Content-Type': 'application/json; charset=utf-8',
+            'ETag': '"' + hashlib.sha256(corpo).hexdigest()[:32] + '"',
+            'Last-Modified': formatdate(fs.st_mtime, usegmt=True),
+        })
+    ultima_atualizacao = dados.get('ultima_atualizacao') if isinstance(dados, dict) else None
+    return fs.st_mtime_ns, fs.st_size, fatias, ultima_atualizacao
+
+def data_atualizacao(nome_arquivo):
+    """`ultima_atualizacao` de um artefato, lida pelo mesmo cache das rotas de dados"""
+    if carregar_payload(nome_arquivo) is None:
+        return None
+    with _payloads_lock:
+        return _payloads[nome_arquivo][3]
+
+def carregar_registro_estagios(serie):
+    """Registro de estágios gravado pelo pipeline (data/estagios_{serie}.json), ou {}"""
+    try:
+        with open(diretorio_dados() / f'estagios_{serie}.json', 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def rota_metrica(caminho):
+    """Rota da API sem os valores variáveis (rótulo das métricas); None fora de /api/"""
+    partes = [parte for parte in urllib.parse.urlsplit(caminho).path.split('/') if parte]
+    if not partes or partes[0] != 'api':
+        return None
+    if len(partes) == 1:
+        return '/api'
+    if partes[1] in SERIES:
+        if len(partes) == 2:
+            return '/api/{serie}'
+        return {'team': '/api/{serie}/team/{nome}', 'probabilities': '/api/{serie}/probabilities',
+                'round': '/api/{serie}/round/{n}'}.get(partes[2], '/api/{serie}/desconhecida')
+    return f'/api/{partes[1]}' if partes[1] in ('status', 'debug', 'metrics') else '/api/desconhecida'
+
+def registrar_requisicao(rota, status, duracao):
+    """Conta uma requisição e sua latência (segundos) no histograma da rota"""
+    with _metricas_lock:
+        chave = (rota, str(status))
+        _requisicoes[chave] = _requisicoes.get(chave, 0) + 1
+        contagens, soma, total = _latencias.get(rota) or ([0] * len(BUCKETS_LATENCIA), 0.0, 0)
+        for i, limite in enumerate(BUCKETS_LATENCIA):
+            if duracao <= limite:
+                contagens[i] += 1
+        _latencias[rota] = (contagens, soma + duracao, total + 1)
+
+def rotulos(**valores):
+    """{chave="valor",...} com o escape do formato texto do Prometheus"""
+    escapar = lambda valor: str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{' + ','.join(f'{chave}="{escapar(valor)}"' for chave, valor in valores.items()) + '}'
+
+def gerar_metricas():
+    """Métricas em formato texto do Prometheus: frescor dos dados, estágios do pipeline e requisições"""
+    linhas = []
+    def metrica(nome, tipo, ajuda, amostras):
+        linhas.append(f'# HELP {nome} {ajuda}')
+        linhas.append(f'# TYPE {nome} {tipo}')
+        linhas.extend(f'{nome}{rotulos(**r)} {valor}' for r, valor in amostras)
+    
+    agora = time.time()
+    atualizacoes, duracoes, cpus, execucoes, vazao = [], [], [], [], []
+    for serie in sorted(set(SERIES.values())):
+        try:
+            atualizado = datetime.fromisoformat(data_atualizacao(f'web_{serie}.json')).timestamp()
+            atualizacoes.append(({'serie': serie}, atualizado))
+        except (TypeError, ValueError):
+            pass
         
-        # Rota para debug do sistema de arquivos
-        elif self.path.startswith('/api/debug'):
+        for estagio, entrada in sorted(carregar_registro_estagios(serie).items()):
+            r = {'serie': serie, 'estagio': estagio}
+            if entrada.get('duracao') is not None:
+                duracoes.append((r, float(entrada['duracao'])))
+            if entrada.get('cpu') is not None:
+                cpus.append((r, float(entrada['cpu'])))
             try:
-                debug_info = {
-                    'current_directory': os.getcwd(),
-                    'files_in_root': [],
-                    'data_directory_exists': False,
-                    'data_files': []
-                }
-                
-                # Listar arquivos no diretório raiz
-                try:
-                    debug_info['files_in_root'] = os.listdir('.')
-                except:
-                    pass
-                
-                # Verificar se pasta data existe
-                if os.path.exists('data'):
-                    debug_info['data_directory_exists'] = True
-                    try:
-                        debug_info['data_files'] = os.listdir('data')
-                    except:
-                        pass
-                
-                self.wfile.write(json.dumps(debug_info, indent=2).encode())
-            except Exception as e:
-                self.wfile.write(json.dumps({'error': str(e)}).encode())
-        
-        # Rota para status do sistema
-        elif self.path.startswith('/api/status'):
-            status = {
-                'status': 'online',
-                'message': 'Sistema de Análise e Simulação - Campeonato Brasileiro 2025',
-                'version': '1.0.0',
-                'endpoints': [
-                    '/api/serie-a',
-                    '/api/serie-b',
-                    '/api/status',
-                    '/api/debug'
-                ]
-            }
-            self.wfile.write(json.dumps(status).encode())
+                execucoes.append((r, datetime.fromisoformat(entrada['data']).timestamp()))
+            except (KeyError, TypeError, ValueError):
+                pass
+            if estagio == 'simulacao' and entrada.get('simulacoes') and entrada.get('duracao'):
+                vazao.append(({'serie': serie}, entrada['simulacoes'] / entrada['duracao']))
+    
+    metrica('brasileirao_dados_idade_segundos', 'gauge',
+            'Segundos desde a ultima_atualizacao de web_{serie}.json',
+            [(r, round(agora - atualizado, 3)) for r, atualizado in atualizacoes])
+    metrica('brasileirao_dados_ultima_atualizacao_timestamp_segundos', 'gauge',
+            'ultima_atualizacao de web_{serie}.json (Unix)', atualizacoes)
+    metrica('brasileirao_estagio_duracao_segundos', 'gauge',
+            'Tempo de parede da última execução de cada estágio do pipeline', duracoes)
+    metrica('brasileirao_estagio_cpu_segundos', 'gauge',
+            'Tempo de CPU da última execução de cada estágio do pipeline', cpus)
+    metrica('brasileirao_estagio_ultima_execucao_timestamp_segundos', 'gauge',
+            'Fim da última execução de cada estágio do pipeline (Unix)', execucoes)
+    metrica('brasileirao_simulacoes_por_segundo', 'gauge',
+            'Vazão da última simulação de Monte Carlo da série', [(r, round(v, 1)) for r, v in vazao])
+    
+    with _metricas_lock:
+        requisicoes = sorted(_requisicoes.items())
+        latencias = sorted((rota, (list(c), soma, total)) for rota, (c, soma, total) in _latencias.items())
+    metrica('brasileirao_requisicoes_total', 'counter', 'Requisições atendidas por este processo',
+            [({'rota': rota, 'status': status}, total) for (rota, status), total in requisicoes])
+    
+    nome = 'brasileirao_requisicao_duracao_segundos'
+    linhas.append(f'# HELP {nome} Latência das requisições atendidas por este processo')
+    linhas.append(f'# TYPE {nome} histogram')
+    for rota, (contagens, soma, total) in latencias:
+        for limite, contagem in zip(BUCKETS_LATENCIA, contagens):
+            linhas.append(f'{nome}_bucket{rotulos(rota=rota, le=f"{limite:g}")} {contagem}')
+        linhas.append(f'{nome}_bucket{rotulos(rota=rota, le="+Inf")} {total}')
+        linhas.append(f'{nome}_sum{rotulos(rota=rota)} {round(soma, 6)}')
+        linhas.append(f'{nome}_count{rotulos(rota=rota)} {total}')
+    return '\n'.join(linhas) + '\n'
+
+def etag_confere(etag, if_none_match):
+    """If-None-Match lista a ETag (comparação fraca do RFC 9110: ignora W/, que proxies com gzip acrescentam)"""
+    etags = [valor.strip().removeprefix('W/') for valor in (if_none_match or '').split(',')]
+    return '*' in etags or etag.removeprefix('W/') in etags
+
+def responder_payload(payload, cabecalhos_requisicao):
+    """200 com o corpo em cache, ou 304 se o cliente já tem a mesma ETag"""
+    corpo, cabecalhos = payload
+    if etag_confere(cabecalhos['ETag'], cabecalhos_requisicao.get('If-None-Match')):
+        return 304, b'', {k: v for k, v in cabecalhos.items() if k != 'Content-Type'}
+    return 200, corpo, cabecalhos
+
+def resposta_json(dados, status=200):
+    """Resposta não cacheável (status, erros, debug)"""
+    return status, serializar(dados), {'Content-Type': 'application/json; charset=utf-8',
+                                        'Cache-Control': 'no-store'}
+
+def responder_fatia(serie, partes, consulta, cabecalhos_requisicao):
+    """Rotas /api/{serie}/team/{nome}, /probabilities?zone= e /round/{n|proxima} (None se a rota não existir)"""
+    recurso = partes[0]
+    if recurso == 'team' and len(partes) == 2:
+        chave, descricao = ('team', normalizar_nome(partes[1])), f"Time '{partes[1]}'"
+    elif recurso == 'probabilities' and len(partes) == 1:
+        zona = consulta.get('zone', [None])[0]
+        chave, descricao = ('probabilities', zona), f"Zona '{zona}'"
+    elif recurso == 'round' and len(partes) == 2 and partes[1] == 'proxima':
+        chave, descricao = ('round', 'proxima'), "Próxima rodada"
+    elif recurso == 'round' and len(partes) == 2 and partes[1].isdigit():
+        chave, descricao = ('round', str(int(partes[1]))), f"Rodada {partes[1]}"
+    else:
+        return None
+    
+    payload = carregar_payload(f'indices_{serie}.json', chave, fatiar_indices)
+    if payload is None:
+        return resposta_json({'error': f'{descricao} não encontrado(a) nos índices da {serie}'}, 404)
+    return responder_payload(payload, cabecalhos_requisicao)
+
+def responder_api(caminho, cabecalhos_requisicao=None):
+    """Roteia um GET da API e devolve (status, corpo, cabeçalhos)"""
+    cabecalhos_requisicao = cabecalhos_requisicao or {}
+    url = urllib.parse.urlsplit(caminho)
+    partes = [urllib.parse.unquote(parte) for parte in url.path.split('/') if parte]
+    rota = partes[1] if len(partes) > 1 and partes[0] == 'api' else ''
+    
+    # Dados completos de uma série ou fatias dos índices do estágio web
+    if rota in SERIES:
+        serie = SERIES[rota]
+        if len(partes) > 2:
+            resposta = responder_fatia(serie, partes[2:], urllib.parse.parse_qs(url.query), cabecalhos_requisicao)
+            return resposta or resposta_json({'error': f'Rota não encontrada: {url.path}'}, 404)
         
-        # Rota padrão
-        else:
-            self.wfile.write(json.dumps({
-                'message': 'API do Sistema de Análise e Simulação',
-                'endpoints': [
-                    '/api/serie-a',
-                    '/api/serie-b', 
-                    '/api/status'
-                ]
-            }).encode())
+        payload = carregar_payload(f'web_{serie}.json')
+        if payload is None:
+            return resposta_json({'error': f'Dados da {serie} não encontrados em {diretorio_dados()}'}, 404)
+        return responder_payload(payload, cabecalhos_requisicao)
+    
+    # Métricas para o Prometheus
+    if rota == 'metrics':
+        return 200, gerar_metricas().encode('utf-8'), {'Content-Type': CONTENT_TYPE_METRICAS,
+                                                        'Cache-Control': 'no-store'}
+    
+    # Debug do sistema de arquivos
+    if rota == 'debug':
+        diretorio = diretorio_dados()
+        return resposta_json({
+            'current_directory': os.getcwd(),
+            'data_directory': str(diretorio),
+            'data_directory_exists': diretorio.is_dir(),
+            'data_files': sorted(os.listdir(diretorio)) if diretorio.is_dir() else [],
+            'cached_payloads': sorted(_payloads),
+        })
+    
+    # Status do sistema
+    if rota == 'status':
+        return resposta_json({
+            'status': 'online',
+            'message': 'Sistema de Análise e Simulação - Campeonato Brasileiro 2025',
+            'version': '1.0.0',
+            'endpoints': [
+                '/api/serie-a',
+                '/api/serie-b',
+                '/api/{serie}/team/{nome}',
+                '/api/{serie}/probabilities?zone={titulo|libertadores|acesso_serie_a|rebaixamento}',
+                '/api/{serie}/round/{n|proxima}',
+                '/api/status',
+                '/api/metrics',
+                '/api/debug'
+            ]
+        })
+    
+    # Rota padrão
+    return resposta_json({
+        'message': 'API do Sistema de Análise e Simulação',
+        'endpoints': [
+            '/api/serie-a',
+            '/api/serie-b',
+            '/api/{serie}/team/{nome}',
+            '/api/{serie}/probabilities?zone=',
+            '/api/{serie}/round/{n|proxima}',
+            '/api/status',
+            '/api/metrics'
+        ]
+    })
+
+class handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        inicio = time.perf_counter()
+        status, corpo, cabecalhos = responder_api(self.path, self.headers)
+        self.send_response(status)
+        for nome, valor in {**CABECALHOS_CORS, **cabecalhos}.items():
+            self.send_header(nome, valor)
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+        registrar_requisicao(rota_metrica(self.path) or '/api/desconhecida', status, time.perf_counter() - inicio)
     
     def do_OPTIONS(self):
         self.send_response(200)
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        for nome, valor in CABECALHOS_CORS.items():
+            self.send_header(nome, valor)
+        self.send_header('Content-Length', '0')
         self.end_headers()
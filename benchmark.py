@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BENCHMARK.PY - Medição de desempenho do pipeline (offline)
+Campeonato Brasileiro - Series A e B 2025
+
+Mede, com os dados versionados em data/ (cache_jogos_*.json e
+proximos_jogos_*.json) como fixtures:
+- carregar_temporada, calcular_estatisticas_retrospectivas,
+  analisar_jogos_futuros e calcular_classificacao_real
+- simular_campeonato (motor original) e simular_campeonato_acumulado
+  (motor padrão) em vários números de simulações
+- processar_dados_web
+
+Tudo roda num diretório temporário com cópias das fixtures, em modo replay
+(nenhuma chamada de rede) e sem tocar nos arquivos de data/. As cópias são
+migradas para o formato atual antes das medições, então carregar_temporada
+mede a leitura normal, não a migração.
+
+Uso:
+    python benchmark.py                    # Mede e compara com benchmark_baseline.json
+    python benchmark.py --salvar-baseline  # Mede e grava uma nova baseline
+    python benchmark.py --somente-aviso    # Baseline de outro ambiente não faz falhar
+    python benchmark.py --filtro simular   # Só os casos cujo nome contém "simular"
+    python benchmark.py --rapido           # Menos simulações por caso
+
+A comparação usa o menor tempo de cada caso e ignora diferenças abaixo de
+PISO_RUIDO. Sai com código 1 se algum caso regredir; com --somente-aviso, uma
+baseline medida em outro ambiente só gera aviso.
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+import sistema_completo as sc
+
+RAIZ = Path(__file__).resolve().parent
+ARQUIVO_BASELINE = RAIZ / "benchmark_baseline.json"
+SERIES = ("serie_a", "serie_b")
+FIXTURES = ("cache_jogos_{serie}.json", "proximos_jogos_{serie}.json")
+
+# Simulações por caso: o motor original é um laço Python, bem mais lento que o acumulador
+SIMULACOES_ORIGINAL = (500, 2000)
+SIMULACOES_ACUMULADOR = (10000, 100000, sc.NUM_SIMULACOES)
+SIMULACOES_RAPIDO = {"original": (500,), "acumulador": (10000,)}
+
+SEED = 42
+# Repetições por caso: até REPETICOES, parando após TEMPO_MAXIMO_CASO segundos (mas nunca menos de MIN_REPETICOES)
+REPETICOES = 30
+MIN_REPETICOES = 5
+TEMPO_MAXIMO_CASO = 10.0
+
+# Regressão: menor tempo acima da baseline por mais que LIMITE_REGRESSAO e por mais que PISO_RUIDO segundos
+LIMITE_REGRESSAO = 0.20
+PISO_RUIDO = 0.002
+
+def hash_fixtures(diretorio_dados):
+    """SHA-256 das fixtures: baseline e medição só são comparáveis com os mesmos dados"""
+    h = hashlib.sha256()
+    for serie in SERIES:
+        for modelo in FIXTURES:
+            h.update((diretorio_dados / modelo.format(serie=serie)).read_bytes())
+    return h.hexdigest()[:16]
+
+@contextlib.contextmanager
+def ambiente_isolado():
+    """Diretório temporário com cópia das fixtures em data/, modo replay e backend JSON"""
+    origem = RAIZ / "data"
+    diretorio_anterior = os.getcwd()
+    replay_anterior, backend_anterior = sc.MODO_REPLAY, sc.BACKEND_CACHE
+    with tempfile.TemporaryDirectory(prefix="benchmark_") as temporario:
+        destino = Path(temporario) / "data"
+        destino.mkdir()
+        for serie in SERIES:
+            for modelo in FIXTURES:
+                shutil.copy2(origem / modelo.format(serie=serie), destino)
+        sc.definir_modo_replay(True)
+        sc.definir_backend_cache("json")
+        os.chdir(temporario)
+        try:
+            migrar_fixtures()
+            yield
+        finally:
+            os.chdir(diretorio_anterior)
+            sc.definir_modo_replay(replay_anterior)
+            sc.definir_backend_cache(backend_anterior)
+
+def migrar_fixtures():
+    """Converte as cópias das fixtures (data/ do diretório atual) para o formato atual de eventos"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        for serie in SERIES:
+            sc.migrar_cache_arquivo(serie)
+            arquivo = Path(f"data/proximos_jogos_{serie}.json")
+            with open(arquivo, 'r', encoding='utf-8') as f:
+                proximos = json.load(f)
+            proximos = {time: [sc.projetar_evento(evento) for evento in eventos] for time, eventos in proximos.items()}
+            with open(arquivo, 'w', encoding='utf-8') as f:
+                json.dump(proximos, f, ensure_ascii=False, indent=2)
+
+def medir(funcao, repeticoes=REPETICOES, tempo_maximo=TEMPO_MAXIMO_CASO):
+    """Tempos (s) de até `repeticoes` execuções após um aquecimento; a saída do pipeline é descartada
+    
+    Para depois de `tempo_maximo` segundos medidos, desde que já tenha MIN_REPETICOES.
+    """
+    tempos = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        funcao()
+        while len(tempos) < repeticoes:
+            inicio = time.perf_counter()
+            funcao()
+            tempos.append(time.perf_counter() - inicio)
+            if len(tempos) >= MIN_REPETICOES and sum(tempos) >= tempo_maximo:
+                break
+    return tempos
+
+def preparar_serie(serie):
+    """Temporada, estatísticas e resultados de simulação usados pelos casos de uma série"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        temporada = sc.carregar_temporada(serie)
+        jogos_futuros = sc.analisar_jogos_futuros(temporada, serie)
+        stats_por_time = sc.calcular_estatisticas_retrospectivas(temporada, serie)
+        # processar_dados_web lê o .npz da simulação
+        resultados = sc.simular_campeonato_acumulado(jogos_futuros, stats_por_time, 10000, seed=SEED, workers=1)
+        sc.salvar_resultados_simulacao(resultados, serie)
+    return temporada, jogos_futuros, stats_por_time
+
+def simular_original(jogos_futuros, stats_por_time, num_simulacoes):
+    """Motor original com os geradores globais semeados (mesmo caminho de executar_simulacao)"""
+    sc.random.seed(SEED)
+    np.random.seed(SEED)
+    sc.simular_campeonato(jogos_futuros, stats_por_time, num_simulacoes)
+
+def casos_benchmark(rapido=False):
+    """(nome, função) de cada caso, para as duas séries"""
+    simulacoes_original = SIMULACOES_RAPIDO["original"] if rapido else SIMULACOES_ORIGINAL
+    simulacoes_acumulador = SIMULACOES_RAPIDO["acumulador"] if rapido else SIMULACOES_ACUMULADOR
+    
+    casos = []
+    for serie in SERIES:
+        temporada, jogos_futuros, stats = preparar_serie(serie)
+        casos += [
+            (f"carregar_temporada[{serie}]", lambda s=serie: sc.carregar_temporada(s)),
+            (f"calcular_estatisticas_retrospectivas[{serie}]",
+             lambda t=temporada, s=serie: sc.calcular_estatisticas_retrospectivas(t, s)),
+            (f"analisar_jogos_futuros[{serie}]", lambda t=temporada, s=serie: sc.analisar_jogos_futuros(t, s)),
+            (f"calcular_classificacao_real[{serie}]",
+             lambda t=temporada, s=serie: sc.calcular_classificacao_real(t, s)),
+        ]
+        for n in simulacoes_original:
+            casos.append((f"simular_campeonato[{serie},n={n}]",
+                          lambda j=jogos_futuros, st=stats, n=n: simular_original(j, st, n)))
+        for n in simulacoes_acumulador:
+            casos.append((f"simular_campeonato_acumulado[{serie},n={n}]",
+                          lambda j=jogos_futuros, st=stats, n=n:
+                          sc.simular_campeonato_acumulado(j, st, n, seed=SEED, workers=1)))
+        casos.append((f"processar_dados_web[{serie}]", lambda s=serie: sc.processar_dados_web(s)))
+    return casos
+
+def executar_benchmarks(filtro=None, repeticoes=REPETICOES, rapido=False):
+    """Mede todos os casos (ou os que contêm `filtro`) e devolve o relatório"""
+    medicoes = {}
+    with ambiente_isolado():
+        for nome, funcao in casos_benchmark(rapido):
+            if filtro and filtro not in nome:
+                continue
+            tempos = medir(funcao, repeticoes)
+            medicoes[nome] = {
+                'mediana': statistics.median(tempos),
+                'minimo': min(tempos),
+                'repeticoes': len(tempos),
+            }
+            print(f"  {nome:<55} {medicoes[nome]['minimo'] * 1000:10.2f} ms (mín. de {len(tempos)})")
+
+    return {
+        'gerado_em': datetime.now().isoformat(),
+        'fixtures': hash_fixtures(RAIZ / "data"),
+        'ambiente': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'plataforma': platform.platform(),
+            'processador': platform.processor() or platform.machine(),
+            'cpus': os.cpu_count(),
+        },
+        'medicoes': medicoes,
+    }
+
+def comparar_com_baseline(atual, baseline, limite=LIMITE_REGRESSAO, piso=PISO_RUIDO):
+    """Imprime a comparação caso a caso (pelo menor tempo) e devolve os nomes dos casos que regrediram
+    
+    Um caso regride quando fica mais lento que a baseline por mais de `limite`
+    (fração) e por mais de `piso` segundos: tempos de microssegundos variam
+    mais que qualquer limite relativo.
+    """
+    if baseline['fixtures'] != atual['fixtures']:
+        print("Aviso: fixtures diferentes das usadas na baseline; tempos podem não ser comparáveis")
+    if baseline['ambiente'] != atual['ambiente']:
+        print(f"Aviso: baseline medida em outro ambiente ({baseline['ambiente']['plataforma']}, "
+              f"Python {baseline['ambiente']['python']}, NumPy {baseline['ambiente']['numpy']})")
+
+    print(f"\n{'caso':<55} {'baseline':>10} {'atual':>10} {'variação':>9}")
+    print("-" * 88)
+    regressoes = []
+    for nome, medicao in atual['medicoes'].items():
+        referencia = baseline['medicoes'].get(nome)
+        if referencia is None:
+            print(f"{nome:<55} {'-':>10} {medicao['minimo'] * 1000:8.2f}ms {'novo':>9}")
+            continue
+        diferenca = medicao['minimo'] - referencia['minimo']
+        variacao = diferenca / referencia['minimo']
+        if abs(diferenca) <= piso:
+            status = ""
+        elif variacao > limite:
+            status = "  REGRESSÃO"
+            regressoes.append(nome)
+        elif variacao < -limite:
+            status = "  melhora"
+        else:
+            status = ""
+        print(f"{nome:<55} {referencia['minimo'] * 1000:8.2f}ms {medicao['minimo'] * 1000:8.2f}ms "
+              f"{variacao:+8.1%}{status}")
+
+    print("-" * 88)
+    if regressoes:
+        print(f"{len(regressoes)} regressão(ões) acima de {limite:.0%} e {piso * 1000:g} ms: {', '.join(regressoes)}")
+    else:
+        print(f"Nenhuma regressão acima de {limite:.0%} e {piso * 1000:g} ms")
+    return regressoes
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks offline do pipeline do Brasileirão")
+    parser.add_argument("--salvar-baseline", action="store_true", help="grava as medições como nova baseline")
+    parser.add_argument("--baseline", type=Path, default=ARQUIVO_BASELINE,
+                        help=f"arquivo da baseline (padrão: {ARQUIVO_BASELINE.name})")
+    parser.add_argument("--filtro", help="só os casos cujo nome contém este texto")
+    parser.add_argument("--repeticoes", type=int, default=REPETICOES,
+                        help=f"máximo de execuções medidas por caso (padrão: {REPETICOES}, "
+                             f"limitado a ~{TEMPO_MAXIMO_CASO:g}s por caso)")
+    parser.add_argument("--limite", type=float, default=LIMITE_REGRESSAO,
+                        help=f"fração de lentidão aceita antes de acusar regressão (padrão: {LIMITE_REGRESSAO})")
+    parser.add_argument("--piso", type=float, default=PISO_RUIDO,
+                        help=f"diferença em segundos abaixo da qual não há regressão (padrão: {PISO_RUIDO})")
+    parser.add_argument("--somente-aviso", action="store_true",
+                        help="regressão contra baseline de outro ambiente só gera aviso (sai com código 0)")
+    parser.add_argument("--rapido", action="store_true", help="menos simulações por caso (verificação rápida)")
+    parser.add_argument("--saida", type=Path, help="grava também as medições atuais em JSON")
+    args = parser.parse_args()
+
+    print("Executando benchmarks (offline, fixtures de data/)...")
+    atual = executar_benchmarks(args.filtro, args.repeticoes, args.rapido)
+
+    if args.saida:
+        args.saida.write_text(json.dumps(atual, ensure_ascii=False, indent=2), encoding='utf-8')
+
+    if args.salvar_baseline:
+        args.baseline.write_text(json.dumps(atual, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"Baseline gravada em {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"Sem baseline em {args.baseline}; rode com --salvar-baseline para criá-la")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressoes = comparar_com_baseline(atual, baseline, args.limite, args.piso)
+    if regressoes and args.somente_aviso and baseline['ambiente'] != atual['ambiente']:
+        print("Baseline de outro ambiente (--somente-aviso): regressões só como referência")
+        return 0
+    return 1 if regressoes else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,7 +7,7 @@ Campeonato Brasileiro - Series A e B 2025
 Este script executa todo o pipeline de analise:
 1. Mantém dados existentes (nunca limpa automaticamente)
 2. Executa sistema completo unificado (todos os processos em um arquivo)
-3. Modo agendador automático (execução diária às 6h, sem parar)
+3. Modo agendador automático (execução diária às 6h + atualização da série logo após cada jogo)
 4. Inicia servidor web (opcional)
 
 O sistema unificado inclui:
@@ -18,7 +18,7 @@ O sistema unificado inclui:
 - Processamento para web
 
 Uso:
-    python main.py              # Modo agendador automático (executa 1x/dia, sem parar)
+    python main.py              # Modo agendador automático (1x/dia + após o fim de cada jogo, sem parar)
     python main.py --clean      # Executa limpando dados antigos
     python main.py -c           # Mesmo que --clean
     python main.py --server     # Executa e inicia servidor web
@@ -27,6 +27,10 @@ Uso:
     python main.py -a           # Mesmo que --agendador
     python main.py --status     # Mostra status do agendador
     python main.py --clean --server  # Limpa dados + executa + servidor
+    python main.py --stages web                 # Só regera os artefatos web
+    python main.py --stages simulate --serie b  # Só a simulação da Série B
+    python main.py --sims 50000 --seed 42       # Simulações e semente
+    python main.py --profile                    # Perfil cProfile por estágio em data/perfis/
 
 Autor: Sistema de Analise Brasileirao
 Data: 2025
@@ -37,15 +41,28 @@ import sys
 import time
 import subprocess
 import json
+import argparse
 from pathlib import Path
 from datetime import datetime, timedelta
 
+import sistema_completo
+
 # Configurações
 DATA_DIR = Path("data")
 LOG_FILE = "execucao_log.txt"
 AGENDADOR_FILE = "agendador_status.json"
 HORA_EXECUCAO = 6  # 6:00 da manhã
 
+# Atualizações pós-jogo (horário de início vem do strTimestamp de proximos_jogos_*.json)
+SERIES = ("serie_a", "serie_b")
+DURACAO_JOGO = timedelta(minutes=115)        # 90' + intervalo + acréscimos
+ATRASO_RESULTADO = timedelta(minutes=15)     # Tempo até o placar final aparecer na API
+JANELA_AGRUPAMENTO = timedelta(minutes=30)   # Jogos que terminam juntos geram uma única atualização
+HORIZONTE_AGENDA = timedelta(days=7)
+INTERVALO_RECHECAGEM = timedelta(minutes=20) # Jogo ainda sem placar final após o prazo: nova atualização...
+MAX_RECHECAGENS = 6                          # ...a cada intervalo, no máximo estas vezes (2h após o prazo)
+INTERVALO_MAXIMO_SONO = 300                  # Segundos; o relógio é conferido de novo a cada intervalo
+
 # Cores para output (Windows)
 class Colors:
     GREEN = '\033[92m'
@@ -78,8 +95,12 @@ def limpar_dados_antigos():
         "cache_jogos_serie_b.json", 
         "proximos_jogos_serie_a.json",
         "proximos_jogos_serie_b.json",
-        "resultados_simulacao_serie_a.json",
-        "resultados_simulacao_serie_b.json"
+        "resultados_simulacao_serie_a.npz",
+        "resultados_simulacao_serie_b.npz",
+        "rodadas_serie_a.json",              # Estado das rodadas finalizadas (descreve o cache removido)
+        "rodadas_serie_b.json",
+        "estagios_serie_a.json",             # Hashes do cache de estágios
+        "estagios_serie_b.json"
     ]
     
     removidos = 0
@@ -94,30 +115,18 @@ def limpar_dados_antigos():
     
     log_message(f"[RESUMO] Total de arquivos removidos: {removidos}", Colors.GREEN)
 
-def executar_script(nome_script, descricao):
-    """Executa um script Python e captura o output"""
-    log_message(f"[EXECUTANDO] {descricao}", Colors.BLUE)
-    
-    # Scripts agora estão no arquivo sistema_completo.py
-    if nome_script.endswith('.py'):
-        # Executa o sistema completo unificado
-        return executar_sistema_completo()
-    
-    log_message(f"[ERRO] Script nao encontrado: {nome_script}", Colors.RED)
-    return False
-
-def verificar_arquivos_gerados():
+def verificar_arquivos_gerados(series=SERIES):
     """Verifica se os arquivos principais foram gerados"""
     log_message("[VERIFICACAO] Verificando arquivos gerados...", Colors.BLUE)
     
-    arquivos_esperados = [
-        "cache_jogos_serie_a.json",
-        "cache_jogos_serie_b.json",
-        "proximos_jogos_serie_a.json", 
-        "proximos_jogos_serie_b.json",
-        "resultados_simulacao_serie_a.json",
-        "resultados_simulacao_serie_b.json"
-    ]
+    arquivos_esperados = []
+    for serie in series:
+        arquivos_esperados += [
+            f"cache_jogos_{serie}.json",
+            f"proximos_jogos_{serie}.json",
+            f"resultados_simulacao_{serie}.npz",
+            f"web_{serie}.json"
+        ]
     
     gerados = 0
     for arquivo in arquivos_esperados:
@@ -134,15 +143,31 @@ def verificar_arquivos_gerados():
     
     return gerados == len(arquivos_esperados)
 
-def gerar_relatorio_final():
-    """Gera um relatório final com estatísticas"""
+def totalizar_estagios(estagios):
+    """Totais da execução: tempos e contadores somados, maior pico de RSS"""
+    executados = [item for item in estagios if not item.get("reutilizado")]
+    totais = {campo: sum(item[campo] for item in executados)
+              for campo in ("duracao", "cpu", *sistema_completo.CONTADORES_ESTAGIO)}
+    totais["duracao"] = round(totais["duracao"], 3)
+    totais["cpu"] = round(totais["cpu"], 3)
+    totais["espera_limite_taxa"] = round(totais["espera_limite_taxa"], 3)
+    picos = [item["pico_rss_mb"] for item in executados if item.get("pico_rss_mb") is not None]
+    totais["pico_rss_mb"] = max(picos) if picos else None
+    totais["estagios_executados"] = len(executados)
+    totais["estagios_reutilizados"] = len(estagios) - len(executados)
+    return totais
+
+def gerar_relatorio_final(sucesso=True, estagios=()):
+    """Gera um relatório final com os arquivos e as métricas de cada estágio"""
     log_message("[RELATORIO] Gerando relatorio final...", Colors.BLUE)
     
     relatorio = {
         "data_execucao": datetime.now().isoformat(),
         "arquivos_gerados": [],
         "tamanhos": {},
-        "status": "SUCESSO"
+        "status": "SUCESSO" if sucesso else "FALHA",
+        "estagios": list(estagios),
+        "totais": totalizar_estagios(estagios)
     }
     
     # Verificar arquivos gerados
@@ -203,104 +228,183 @@ def calcular_proxima_execucao():
     
     return proxima
 
-def aguardar_proxima_execucao():
-    """Aguarda até a próxima execução programada"""
-    proxima = calcular_proxima_execucao()
-    agora = datetime.now()
-    
-    tempo_espera = (proxima - agora).total_seconds()
-    
-    log_message(f"[AGENDADOR] Próxima execução: {proxima.strftime('%Y-%m-%d %H:%M:%S')}", Colors.BLUE)
-    log_message(f"[AGENDADOR] Aguardando {tempo_espera/3600:.1f} horas...", Colors.BLUE)
-    
-    # Aguardar em intervalos de 1 hora para verificar se deve parar
-    while tempo_espera > 0:
-        if tempo_espera > 3600:  # Mais de 1 hora
-            time.sleep(3600)  # Aguardar 1 hora
-            tempo_espera -= 3600
+def aguardar_ate(prazo):
+    """Dorme até o horário exato do prazo
+    
+    O sono é feito em trechos de no máximo INTERVALO_MAXIMO_SONO segundos, medidos
+    sempre contra o relógio: suspensão da máquina ou ajuste de hora não atrasam o prazo.
+    """
+    while True:
+        restante = (prazo - datetime.now()).total_seconds()
+        if restante <= 0:
+            return
+        time.sleep(min(restante, INTERVALO_MAXIMO_SONO))
+
+def jogo_finalizado(evento):
+    """O evento já tem placar final na API"""
+    return (evento.get('intHomeScore') is not None and evento.get('intAwayScore') is not None
+            and evento.get('strStatus') in sistema_completo.STATUS_FINALIZADO)
+
+def horarios_fim_jogos(serie, agora=None):
+    """Horários locais em que cada próximo jogo da série deve ter resultado na API
+    
+    Jogo cujo prazo já passou sem placar final no cache ganha nova atualização a
+    cada INTERVALO_RECHECAGEM, até MAX_RECHECAGENS vezes (placar atrasado na API).
+    """
+    agora = agora or datetime.now()
+    arquivo = DATA_DIR / f"proximos_jogos_{serie}.json"
+    if not arquivo.exists():
+        return []
+    try:
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            proximos = json.load(f)
+    except (OSError, ValueError):
+        return []
+    
+    prazos = {}
+    cache = None
+    for eventos in proximos.values():
+        for evento in eventos:
+            inicio = sistema_completo.inicio_evento(evento)
+            if inicio is None or evento.get('strPostponed') == "yes":
+                continue
+            prazo = inicio.astimezone().replace(tzinfo=None) + DURACAO_JOGO + ATRASO_RESULTADO
+            if prazo <= agora:
+                if cache is None:
+                    cache = sistema_completo.carregar_cache(serie)
+                if jogo_finalizado(cache.get(sistema_completo.chave_evento(evento), evento)):
+                    continue
+                tentativa = (agora - prazo) // INTERVALO_RECHECAGEM + 1
+                if tentativa > MAX_RECHECAGENS:
+                    continue
+                prazo += tentativa * INTERVALO_RECHECAGEM
+            if prazo <= agora + HORIZONTE_AGENDA:
+                prazos[evento.get('idEvent') or evento.get('strTimestamp')] = prazo
+    return sorted(prazos.values())
+
+def agrupar_prazos(prazos):
+    """Une prazos próximos (JANELA_AGRUPAMENTO) em uma atualização após o último deles"""
+    grupos = []
+    for prazo in prazos:
+        if grupos and prazo - grupos[-1][0] <= JANELA_AGRUPAMENTO:
+            grupos[-1][1] = prazo
         else:
-            time.sleep(tempo_espera)  # Aguardar o tempo restante
-            break
+            grupos.append([prazo, prazo])
+    return [fim for _, fim in grupos]
 
-def executar_sistema_completo():
-    """Executa o sistema completo usando script unificado"""
-    log_message("[SISTEMA] Iniciando execução completa...", Colors.BLUE)
-    
-    # Executar script unificado
-    if executar_script("sistema_completo.py", "Sistema Completo Unificado"):
+def montar_agenda(agora=None):
+    """Próximos eventos do agendador: (horário, tipo, série), ordenados
+    
+    Tipos: "diaria" (sistema completo às HORA_EXECUCAO) e "serie" (atualização pós-jogo).
+    """
+    agora = agora or datetime.now()
+    agenda = [(calcular_proxima_execucao(), "diaria", None)]
+    for serie in SERIES:
+        agenda += [(prazo, "serie", serie) for prazo in agrupar_prazos(horarios_fim_jogos(serie, agora))]
+    return sorted(agenda, key=lambda item: item[0])
+
+def registrar_execucao(sucesso, **detalhes):
+    """Acrescenta uma execução ao histórico do agendador (últimas 30)"""
+    agora = datetime.now()
+    status = carregar_status_agendador()
+    status["execucoes"].append({
+        "data": agora.isoformat(),
+        "sucesso": sucesso,
+        "sucessos": 1 if sucesso else 0,
+        "falhas": 0 if sucesso else 1,
+        **detalhes
+    })
+    status["execucoes"] = status["execucoes"][-30:]
+    salvar_status_agendador(status)
+
+def executar_atualizacao_serie(serie):
+    """Atualização pós-jogo de uma única série"""
+    log_message(f"[AGENDADOR] Atualizando {serie.upper()} após fim de jogo...", Colors.BLUE)
+    estagios = []
+    sucesso = sistema_completo.executar_atualizacao_serie(serie, relatorio=estagios)
+    gerar_relatorio_final(sucesso, estagios)
+    registrar_execucao(sucesso, tipo="serie", serie=serie,
+                       estagios=estagios, totais=totalizar_estagios(estagios))
+    if sucesso:
+        log_message(f"[AGENDADOR] {serie.upper()} atualizada!", Colors.GREEN)
+    else:
+        log_message(f"[AGENDADOR] Atualização da {serie.upper()} falhou!", Colors.RED)
+    return sucesso
+
+def executar_sistema_completo(etapas=sistema_completo.ETAPAS_PIPELINE, series=SERIES,
+                              num_simulacoes=sistema_completo.NUM_SIMULACOES, seed=None, forcar=False):
+    """Executa o pipeline de sistema_completo no próprio processo
+    
+    Só uma execução completa (todas as etapas, as duas séries) conta como a
+    execução diária do agendador. As métricas dos estágios vão para
+    relatorio_execucao.json e para o histórico do agendador.
+    """
+    log_message(f"[SISTEMA] Iniciando execução: etapas {', '.join(etapas)} | séries {', '.join(series)}",
+                Colors.BLUE)
+    
+    estagios = []
+    sucesso = sistema_completo.executar_sistema_completo(num_simulacoes, seed=seed, forcar=forcar,
+                                                         etapas=etapas, series=series, relatorio=estagios)
+    if sucesso:
         log_message("[OK] Sistema unificado executado com sucesso", Colors.GREEN)
-        
         # Verificar resultados
-        todos_gerados = verificar_arquivos_gerados()
-        
-        # Atualizar status do agendador
-        agora = datetime.now()
-        status = carregar_status_agendador()
-        status["ultima_execucao"] = agora.isoformat()
-        status["execucoes"].append({
-            "data": agora.isoformat(),
-            "sucesso": todos_gerados,
-            "sucessos": 1 if todos_gerados else 0,
-            "falhas": 0 if todos_gerados else 1
-        })
-        
-        # Manter apenas últimas 30 execuções
-        if len(status["execucoes"]) > 30:
-            status["execucoes"] = status["execucoes"][-30:]
-        
-        salvar_status_agendador(status)
-        
-        return todos_gerados
+        sucesso = verificar_arquivos_gerados(series)
     else:
         log_message("[ERRO] Falha na execução do sistema unificado", Colors.RED)
-        
-        # Atualizar status do agendador com falha
-        agora = datetime.now()
+    
+    # Atualizar status do agendador
+    completa = tuple(etapas) == sistema_completo.ETAPAS_PIPELINE and tuple(series) == SERIES
+    if completa:
         status = carregar_status_agendador()
-        status["ultima_execucao"] = agora.isoformat()
-        status["execucoes"].append({
-            "data": agora.isoformat(),
-            "sucesso": False,
-            "sucessos": 0,
-            "falhas": 1
-        })
-        
+        status["ultima_execucao"] = datetime.now().isoformat()
         salvar_status_agendador(status)
-        
-        return False
+    gerar_relatorio_final(sucesso, estagios)
+    registrar_execucao(sucesso, estagios=estagios, totais=totalizar_estagios(estagios),
+                       **({} if completa else {"etapas": list(etapas), "series": list(series)}))
+    
+    return sucesso
+
+def executar_diaria():
+    """Execução diária completa (pulada se já rodou hoje)"""
+    if ja_executou_hoje():
+        log_message("[AGENDADOR] Sistema já foi executado hoje", Colors.YELLOW)
+        return
+    
+    log_message("[AGENDADOR] Executando sistema...", Colors.BLUE)
+    sucesso = executar_sistema_completo()
+    if sucesso:
+        log_message("[AGENDADOR] Execução concluída com sucesso!", Colors.GREEN)
+    else:
+        log_message("[AGENDADOR] Execução falhou!", Colors.RED)
 
 def modo_agendador():
-    """Modo agendador - executa automaticamente uma vez por dia"""
+    """Modo agendador - execução diária + atualização de cada série logo após o fim dos jogos
+    
+    Dorme até o próximo prazo da agenda (sem polling). A agenda é refeita depois de
+    cada execução, já que ela atualiza proximos_jogos_*.json.
+    """
     log_message("[AGENDADOR] Modo agendador ativado", Colors.BLUE)
     log_message("[AGENDADOR] Pressione Ctrl+C para parar", Colors.YELLOW)
     
     try:
+        # Recupera a execução do dia se o agendador subiu depois do horário
+        if datetime.now().hour >= HORA_EXECUCAO and not ja_executou_hoje():
+            log_message("[AGENDADOR] Execução de hoje não foi feita - executando agora", Colors.YELLOW)
+            executar_diaria()
+        
         while True:
-            agora = datetime.now()
+            prazo, tipo, serie = montar_agenda()[0]
+            descricao = "execução diária" if tipo == "diaria" else f"atualização pós-jogo da {serie.upper()}"
+            espera = max((prazo - datetime.now()).total_seconds(), 0)
+            log_message(f"[AGENDADOR] Próxima: {descricao} em {prazo.strftime('%Y-%m-%d %H:%M:%S')} "
+                        f"(aguardando {espera/3600:.1f} horas)", Colors.BLUE)
             
-            # Verificar se é hora de executar
-            if agora.hour == HORA_EXECUCAO and agora.minute == 0:
-                log_message("[AGENDADOR] Hora de execução atingida!", Colors.GREEN)
-                
-                # Verificar se já executou hoje
-                if not ja_executou_hoje():
-                    log_message("[AGENDADOR] Executando sistema...", Colors.BLUE)
-                    
-                    # Executar sistema completo
-                    sucesso = executar_sistema_completo()
-                    
-                    if sucesso:
-                        log_message("[AGENDADOR] Execução concluída com sucesso!", Colors.GREEN)
-                    else:
-                        log_message("[AGENDADOR] Execução falhou!", Colors.RED)
-                else:
-                    log_message("[AGENDADOR] Sistema já foi executado hoje", Colors.YELLOW)
-                
-                # Aguardar até amanhã
-                aguardar_proxima_execucao()
+            aguardar_ate(prazo)
+            
+            if tipo == "diaria":
+                executar_diaria()
             else:
-                # Aguardar 1 minuto e verificar novamente
-                time.sleep(60)
+                executar_atualizacao_serie(serie)
                 
     except KeyboardInterrupt:
         log_message("[AGENDADOR] Modo agendador interrompido pelo usuário", Colors.YELLOW)
@@ -332,6 +436,12 @@ def mostrar_status_agendador():
     proxima = calcular_proxima_execucao()
     print(f"Proxima execucao: {proxima.strftime('%Y-%m-%d %H:%M:%S')}")
     
+    atualizacoes = [(prazo, serie) for prazo, tipo, serie in montar_agenda() if tipo == "serie"]
+    if atualizacoes:
+        print(f"\nAtualizacoes pos-jogo agendadas ({len(atualizacoes)}):")
+        for prazo, serie in atualizacoes[:10]:
+            print(f"  {prazo.strftime('%Y-%m-%d %H:%M')} - {serie.upper()}")
+    
     # Mostrar últimas execuções
     if status.get("execucoes"):
         print(f"\nUltimas {min(5, len(status['execucoes']))} execucoes:")
@@ -340,7 +450,12 @@ def mostrar_status_agendador():
             status_icon = "[OK]" if execucao["sucesso"] else "[ERRO]"
             sucessos = execucao.get("sucessos", 0)
             falhas = execucao.get("falhas", 0)
-            print(f"  {status_icon} {data.strftime('%Y-%m-%d %H:%M')} ({sucessos} sucessos, {falhas} falhas)")
+            tipo = f" [{execucao['serie'].upper()}]" if execucao.get("serie") else ""
+            totais = execucao.get("totais")
+            metricas = (f" - {totais['duracao']:.0f}s, {totais['requisicoes_http']} req HTTP, "
+                        f"{totais['acertos_cache_http']} do cache" if totais else "")
+            print(f"  {status_icon} {data.strftime('%Y-%m-%d %H:%M')}{tipo} ({sucessos} sucessos, {falhas} falhas)"
+                  f"{metricas}")
     
     print("="*60)
 
@@ -363,30 +478,51 @@ def main():
         return False
     
     # Verificar argumentos de linha de comando
-    limpar_dados = False
-    iniciar_servidor = False
-    modo_agendador_ativo = False
-    
-    # Verificar argumentos
-    for arg in sys.argv[1:]:
-        if arg in ['--clean', '-c', '--limpar']:
-            limpar_dados = True
-            log_message("[INFO] Modo limpeza ativado via argumento", Colors.YELLOW)
-        elif arg in ['--server', '-s', '--web']:
-            iniciar_servidor = True
-            log_message("[INFO] Modo servidor web ativado via argumento", Colors.YELLOW)
-        elif arg in ['--agendador', '-a', '--daemon']:
-            modo_agendador_ativo = True
-            log_message("[INFO] Modo agendador ativado via argumento", Colors.YELLOW)
-        elif arg in ['--status']:
-            mostrar_status_agendador()
-            return True
-        elif arg in ['--force']:
-            # Força execução mesmo se já executou hoje
-            log_message("[INFO] Modo forçado ativado", Colors.YELLOW)
+    parser = argparse.ArgumentParser(description="Sistema Completo de Analise e Simulacao - Brasileirao 2025")
+    parser.add_argument("--clean", "-c", "--limpar", dest="limpar", action="store_true",
+                        help="remove os dados antigos antes de executar")
+    parser.add_argument("--server", "-s", "--web", dest="servidor", action="store_true",
+                        help="inicia o servidor web ao final")
+    parser.add_argument("--agendador", "-a", "--daemon", dest="agendador", action="store_true",
+                        help="modo agendador (diário + pós-jogo)")
+    parser.add_argument("--status", action="store_true", help="mostra o status do agendador")
+    parser.add_argument("--force", dest="forcar", action="store_true",
+                        help="executa todos os estágios mesmo com entradas inalteradas")
+    parser.add_argument("--stages", type=sistema_completo.interpretar_etapas,
+                        default=sistema_completo.ETAPAS_PIPELINE,
+                        help="etapas a executar, separadas por vírgula: fetch,simulate,web (padrão: todas)")
+    parser.add_argument("--serie", type=sistema_completo.interpretar_series, default=SERIES,
+                        help="série a processar: a, b ou ambas (padrão: ambas)")
+    parser.add_argument("--sims", type=int, default=sistema_completo.NUM_SIMULACOES,
+                        help="número de simulações por série")
+    parser.add_argument("--seed", type=int, default=None, help="semente para resultados reprodutíveis")
+    parser.add_argument("--replay", action="store_true",
+                        help="usa apenas respostas gravadas em data/cache_http (sem rede)")
+    parser.add_argument("--backend", choices=["json", "sqlite"], default=sistema_completo.BACKEND_CACHE,
+                        help="armazenamento dos eventos (sqlite grava data/eventos.db e exporta o JSON)")
+    parser.add_argument("--profile", action="store_true",
+                        help="grava um perfil cProfile (.pstats) por estágio em data/perfis/")
+    args = parser.parse_args()
+    if args.replay:
+        sistema_completo.definir_modo_replay(True)
+    sistema_completo.definir_backend_cache(args.backend)
+    sistema_completo.definir_perfilamento(args.profile)
+    
+    if args.status:
+        mostrar_status_agendador()
+        return True
+    if args.limpar:
+        log_message("[INFO] Modo limpeza ativado via argumento", Colors.YELLOW)
+    if args.servidor:
+        log_message("[INFO] Modo servidor web ativado via argumento", Colors.YELLOW)
+    if args.forcar:
+        log_message("[INFO] Modo forçado ativado", Colors.YELLOW)
+    if args.replay:
+        log_message("[INFO] Modo replay ativado (sem rede, só data/cache_http)", Colors.YELLOW)
     
     # Se modo agendador ativado, executar diretamente
-    if modo_agendador_ativo:
+    if args.agendador:
+        log_message("[INFO] Modo agendador ativado via argumento", Colors.YELLOW)
         modo_agendador()
         return True
     
@@ -397,19 +533,13 @@ def main():
         return True
     
     # Nunca limpar dados automaticamente - sempre manter dados existentes
-    if not limpar_dados:
-        log_message("[INFO] Mantendo dados existentes (modo automatico)", Colors.YELLOW)
-    
-    if limpar_dados:
+    if args.limpar:
         limpar_dados_antigos()
     else:
         log_message("[INFO] Mantendo dados existentes", Colors.YELLOW)
     
-    # Executar sistema completo
-    sucesso = executar_sistema_completo()
-    
-    # Gerar relatório final
-    relatorio = gerar_relatorio_final()
+    # Executar as etapas pedidas (grava também o relatório final)
+    sucesso = executar_sistema_completo(args.stages, args.serie, args.sims, seed=args.seed, forcar=args.forcar)
     
     # Resumo final
     print("\n" + "="*80)
@@ -426,7 +556,7 @@ def main():
     log_message(f"[RELATORIO] Relatorio salvo em: relatorio_execucao.json", Colors.BLUE)
     
     # Iniciar servidor web se solicitado
-    if iniciar_servidor and sucesso:
+    if args.servidor and sucesso:
         log_message("[WEB] Iniciando servidor web...", Colors.BLUE)
         try:
             subprocess.Popen([sys.executable, "server.py"], cwd=".")
@@ -2,9 +2,8 @@
 class DataLoader {
     static async loadJSON(url) {
         try {
-            // Adicionar timestamp para evitar cache
-            const urlWithTimestamp = `${url}?t=${Date.now()}`;
-            const response = await fetch(urlWithTimestamp);
+            // Revalidar sempre com o servidor (ETag/Last-Modified): 304 quando nada mudou
+            const response = await fetch(url, { cache: 'no-cache' });
             
             if (!response.ok) {
                 throw new Error(`HTTP error! status: ${response.status}`);
@@ -34,7 +33,7 @@ class DataLoader {
             }
             
             // Fallback para arquivo local
-            const fileUrl = `data/web_${serie}.json`;
+            const fileUrl = `data/web_${serie.replace('-', '_')}.json`;
             console.log(`Fallback para arquivo: ${fileUrl}`);
             const fileData = await this.loadJSON(fileUrl);
             console.log(`Resultado do arquivo:`, fileData);
@@ -52,6 +51,32 @@ class DataLoader {
         }
     }
 
+    // Fatias da API (/api/{serie}/...): só o que um painel mostra, em vez do web_*.json inteiro
+    static async loadSlice(serie, caminho) {
+        const data = await this.loadJSON(`/api/${serie}/${caminho}`);
+        return data && !data.error ? data : null;
+    }
+
+    static async loadZones(serie, zonas) {
+        // Mesmo formato das zonas no payload completo: { zona: { time: probabilidade } }
+        const fatias = await Promise.all(zonas.map(zona => this.loadSlice(serie, `probabilities?zone=${zona}`)));
+        if (fatias.includes(null)) return null;
+        
+        const data = {};
+        fatias.forEach(fatia => {
+            data[fatia.zona] = Object.fromEntries(fatia.probabilidades.map(item => [item.time, item.probabilidade]));
+        });
+        return data;
+    }
+
+    static async loadRound(serie, rodada) {
+        return this.loadSlice(serie, `round/${rodada}`);
+    }
+
+    static isFinished(jogo) {
+        return jogo.intHomeScore !== null && jogo.intHomeScore !== undefined && jogo.intHomeScore !== '';
+    }
+
     static formatPercentage(value) {
         if (value === null || value === undefined || isNaN(value)) {
             return '0.0%';
@@ -491,47 +516,24 @@ class NextGamesManager {
 class StatsManager {
     static async loadAndDisplayStats(series, containerId) {
         try {
-            const cacheData = await DataLoader.loadJSON(`data/cache_jogos_${series}.json`);
-            const resultsData = await DataLoader.loadJSON(`data/resultados_simulacao_${series}.json`);
+            // Números agregados já calculados pelo pipeline (web_*.json)
+            const webData = await DataLoader.loadData(series);
             
-            if (!cacheData || !resultsData) {
+            if (!webData || !webData.estatisticas) {
                 console.error('Erro ao carregar dados de estatísticas');
                 return;
             }
 
-            this.displayStats(cacheData, resultsData, containerId);
+            this.displayStats(webData, containerId);
         } catch (error) {
             console.error('Erro ao carregar estatísticas:', error);
         }
     }
 
-    static displayStats(cacheData, resultsData, containerId) {
-        // Calcular total de jogos
-        let totalGames = 0;
-        Object.values(cacheData).forEach(games => {
-            if (Array.isArray(games)) {
-                totalGames += games.length;
-            }
-        });
-
-        // Calcular média de gols
-        let totalGoals = 0;
-        let gamesWithGoals = 0;
-        
-        Object.values(cacheData).forEach(games => {
-            if (Array.isArray(games)) {
-                games.forEach(game => {
-                    if (game.intHomeScore !== null && game.intAwayScore !== null) {
-                        const homeScore = parseInt(game.intHomeScore) || 0;
-                        const awayScore = parseInt(game.intAwayScore) || 0;
-                        totalGoals += homeScore + awayScore;
-                        gamesWithGoals++;
-                    }
-                });
-            }
-        });
-
-        const avgGoals = gamesWithGoals > 0 ? Number(totalGoals / gamesWithGoals).toFixed(2) : '0.00';
+    static displayStats(webData, containerId) {
+        const estatisticas = webData.estatisticas;
+        const totalGames = estatisticas.total_jogos || 0;
+        const avgGoals = Number(estatisticas.media_gols || 0).toFixed(2);
 
         // Atualizar elementos
         const totalGamesEl = document.getElementById('totalGames');
@@ -540,7 +542,7 @@ class StatsManager {
 
         if (totalGamesEl) totalGamesEl.textContent = DataLoader.formatNumber(totalGames);
         if (avgGoalsEl) avgGoalsEl.textContent = avgGoals;
-        if (lastUpdateEl) lastUpdateEl.textContent = DataLoader.formatDate(new Date().toISOString());
+        if (lastUpdateEl) lastUpdateEl.textContent = DataLoader.formatDate(webData.ultima_atualizacao || new Date().toISOString());
     }
 }
 
@@ -3,32 +3,25 @@ class SerieBManager {
     static async loadData() {
         try {
             console.log('=== INICIANDO CARREGAMENTO SÉRIE B ===');
-            console.log('DataLoader disponível:', typeof DataLoader);
-            console.log('DataLoader.loadData disponível:', typeof DataLoader.loadData);
             
-            // Carregar dados processados para o site
-            console.log('Tentando carregar dados da série-b...');
-            const resultsData = await DataLoader.loadData('serie-b');
-            
-            console.log('Resultado do carregamento:', resultsData);
-            
-            if (!resultsData) {
-                throw new Error('Erro ao carregar dados processados');
+            // Classificação e estatísticas só existem no payload completo; os demais painéis
+            // usam as fatias da API e só caem no payload completo se elas não responderem
+            const precisaCompleto = ['classificationTableBody', 'home-away-table-container']
+                .some(id => document.getElementById(id));
+            let resultsData = null;
+            if (precisaCompleto) {
+                resultsData = await DataLoader.loadData('serie-b');
+                if (!resultsData) {
+                    throw new Error('Erro ao carregar dados processados');
+                }
+                this.displayClassification(resultsData);
+                this.displayStatistics(resultsData);
             }
-
-            console.log('Dados carregados com sucesso:', resultsData);
-            
-            // Carregar dados de próximos jogos
-            const proximosJogosData = await DataLoader.loadJSON('data/proximos_jogos_serie_b.json');
             
-            // Processar e exibir os dados
-            this.displayProbabilities(resultsData);
-            this.displayClassification(resultsData);
-            this.displayStatistics(resultsData);
-            
-            if (proximosJogosData) {
-                this.displayUpcomingGames(proximosJogosData);
-            }
+            await Promise.all([
+                this.loadProbabilities(resultsData),
+                this.loadUpcomingGames(resultsData)
+            ]);
             
             console.log('Série B carregada com sucesso!');
             
@@ -38,6 +31,35 @@ class SerieBManager {
         }
     }
 
+    static async loadProbabilities(resultsData) {
+        if (!document.getElementById('titleTableBody')) return;
+        
+        // /api/serie-b/probabilities?zone= por zona (o payload completo, se já carregado, já as tem)
+        const data = resultsData
+            || await DataLoader.loadZones('serie-b', ['titulo', 'acesso_serie_a', 'rebaixamento'])
+            || await DataLoader.loadData('serie-b');
+        if (!data) {
+            throw new Error('Erro ao carregar probabilidades');
+        }
+        this.displayProbabilities(data);
+    }
+
+    static async loadUpcomingGames(resultsData) {
+        if (!document.getElementById('nextGames')) return;
+        
+        const rodada = await DataLoader.loadRound('serie-b', 'proxima');
+        if (rodada) {
+            this.populateRound('nextGames', rodada);
+            return;
+        }
+        
+        // Sem a API: próximos jogos por time do payload completo
+        const data = resultsData || await DataLoader.loadData('serie-b');
+        if (data) {
+            this.displayUpcomingGames(data);
+        }
+    }
+
     static displayProbabilities(data) {
         console.log('=== EXIBINDO PROBABILIDADES SÉRIE B ===');
         console.log('Dados recebidos:', data);
@@ -201,6 +223,21 @@ class SerieBManager {
         });
     }
 
+    static populateRound(containerId, rodada) {
+        const container = document.getElementById(containerId);
+        if (!container) return;
+
+        const jogos = rodada.jogos.filter(jogo => !DataLoader.isFinished(jogo));
+        container.innerHTML = `
+            <div class="team-games">
+                <h3><i class="fas fa-calendar"></i> Rodada ${rodada.rodada}</h3>
+                <div class="games-list">
+                    ${jogos.map(jogo => this.createGameCard(jogo)).join('')}
+                </div>
+            </div>
+        `;
+    }
+
     static createGameCard(jogo) {
         const date = new Date(jogo.strTimestamp);
         const formattedDate = date.toLocaleDateString('pt-BR');
@@ -5,26 +5,215 @@ Servidor HTTP simples para servir o site localmente
 """
 
 import http.server
-import socketserver
 import webbrowser
 import os
+import argparse
+import hashlib
+import importlib.util
+import threading
+import time
+import urllib.parse
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
 from pathlib import Path
 
-PORT = 8000
+PORT = int(os.environ.get("PORT", 8000))
+HOST = os.environ.get("HOST", "")  # "" = todas as interfaces
+
+# Variantes pré-comprimidas geradas pelo pipeline (ordem de preferência)
+VARIANTES_COMPRIMIDAS = (("br", ".br"), ("gzip", ".gz"))
+
+# Dados e páginas sempre revalidam (ETag/304); demais arquivos estáticos ficam em cache
+CACHE_DADOS = "no-cache"
+CACHE_ESTATICOS = "public, max-age=3600"
+EXTENSOES_REVALIDADAS = (".json", ".html", ".htm")
+
+def carregar_api():
+    """Importa api/index.py: as rotas /api/ locais são as mesmas do deploy no Vercel"""
+    arquivo = Path(__file__).resolve().parent / "api" / "index.py"
+    spec = importlib.util.spec_from_file_location("api_index", arquivo)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+api = carregar_api()
+
+# ETag por arquivo, recalculada só quando mtime/tamanho mudam
+_etags = {}
+_etags_lock = threading.Lock()
+
+def aceita_encoding(accept_encoding, encoding):
+    """True se o cabeçalho Accept-Encoding aceita o encoding (q=0 recusa)"""
+    for item in (accept_encoding or "").split(","):
+        nome, _, parametros = item.strip().partition(";")
+        if nome.strip().lower() not in (encoding, "*"):
+            continue
+        parametros = parametros.replace(" ", "")
+        if parametros.startswith("q="):
+            try:
+                return float(parametros[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+def etag_arquivo(caminho, fs):
+    """ETag forte (SHA-256 do conteúdo) do arquivo gerado pelo pipeline"""
+    versao = (fs.st_mtime_ns, fs.st_size)
+    with _etags_lock:
+        anterior = _etags.get(caminho)
+    if anterior and anterior[0] == versao:
+        return anterior[1]
+    
+    with open(caminho, 'rb') as f:
+        etag = '"' + hashlib.sha256(f.read()).hexdigest()[:32] + '"'
+    with _etags_lock:
+        _etags[caminho] = (versao, etag)
+    return etag
+
+def rota_metrica(caminho_url):
+    """Rótulo da rota nas métricas: o da API, ou um grupo para os arquivos estáticos"""
+    rota = api.rota_metrica(caminho_url)
+    if rota:
+        return rota
+    return "/data/{arquivo}" if urllib.parse.urlsplit(caminho_url).path.startswith("/data/") else "estatico"
+
+def politica_cache(caminho_url):
+    """Cache-Control conforme o tipo de arquivo (None para a API, que define o seu)"""
+    caminho_url = urllib.parse.urlsplit(caminho_url).path
+    if caminho_url.startswith("/api/"):
+        return None
+    if caminho_url.endswith("/") or caminho_url.startswith("/data/") or caminho_url.endswith(EXTENSOES_REVALIDADAS):
+        return CACHE_DADOS
+    return CACHE_ESTATICOS
 
 class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    # HTTP/1.1: conexões keep-alive (todas as respostas levam Content-Length)
+    protocol_version = "HTTP/1.1"
+    
+    def do_GET(self):
+        with self.medir_requisicao():
+            if urllib.parse.urlsplit(self.path).path.startswith('/api/'):
+                self.servir_api()
+            else:
+                super().do_GET()
+    
+    def do_HEAD(self):
+        with self.medir_requisicao():
+            if urllib.parse.urlsplit(self.path).path.startswith('/api/'):
+                self.servir_api(com_corpo=False)
+            else:
+                super().do_HEAD()
+    
+    @contextmanager
+    def medir_requisicao(self):
+        """Conta a requisição e a latência (até o fim do envio) nas métricas de /api/metrics"""
+        self.status_resposta = None
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            api.registrar_requisicao(rota_metrica(self.path), self.status_resposta, time.perf_counter() - inicio)
+    
+    def send_response(self, code, message=None):
+        self.status_resposta = code
+        super().send_response(code, message)
+    
+    def servir_api(self, com_corpo=True):
+        """Delega as rotas /api/ para o roteador de api/index.py"""
+        status, corpo, cabecalhos = api.responder_api(self.path, self.headers)
+        self.send_response(status)
+        for nome, valor in cabecalhos.items():
+            self.send_header(nome, valor)
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        if com_corpo:
+            self.wfile.write(corpo)
+    
+    def variante_comprimida(self, caminho):
+        """Arquivo pré-comprimido aceito pelo cliente e não mais antigo que o original"""
+        if not os.path.isfile(caminho):
+            return None
+        accept_encoding = self.headers.get('Accept-Encoding')
+        for encoding, extensao in VARIANTES_COMPRIMIDAS:
+            arquivo = caminho + extensao
+            if (aceita_encoding(accept_encoding, encoding) and os.path.isfile(arquivo)
+                    and os.path.getmtime(arquivo) >= os.path.getmtime(caminho)):
+                return encoding, arquivo
+        return None
+    
+    def nao_modificado(self, etag, mtime):
+        """Avalia If-None-Match (prioritário) e If-Modified-Since"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match:
+            return api.etag_confere(etag, if_none_match)
+        
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError, OverflowError):
+                return False
+        return False
+    
+    def send_head(self):
+        """Serve arquivos com ETag/Last-Modified, respondendo 304 quando o cliente já tem a versão atual
+        
+        Usa a variante .br/.gz do arquivo, se existir, sem comprimir na requisição.
+        """
+        caminho = self.translate_path(self.path)
+        if os.path.isdir(caminho) and urllib.parse.urlsplit(self.path).path.endswith('/'):
+            caminho = os.path.join(caminho, 'index.html')
+        if not os.path.isfile(caminho):
+            return super().send_head()
+        
+        encoding, arquivo = self.variante_comprimida(caminho) or (None, caminho)
+        try:
+            f = open(arquivo, 'rb')
+        except OSError:
+            self.send_error(404, "File not found")
+            return None
+        
+        try:
+            fs = os.fstat(f.fileno())
+            etag = etag_arquivo(arquivo, fs)
+            ultima_modificacao = self.date_time_string(fs.st_mtime)
+            
+            if self.nao_modificado(etag, fs.st_mtime):
+                f.close()
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Last-Modified', ultima_modificacao)
+                self.end_headers()
+                return None
+            
+            self.send_response(200)
+            self.send_header('Content-Type', self.guess_type(caminho))
+            if encoding:
+                self.send_header('Content-Encoding', encoding)
+            self.send_header('Content-Length', str(fs.st_size))
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', ultima_modificacao)
+            self.end_headers()
+            return f
+        except Exception:
+            f.close()
+            raise
+    
     def end_headers(self):
         # Adicionar headers CORS para permitir carregar arquivos JSON
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        # Adicionar headers para evitar cache
-        self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
-        self.send_header('Pragma', 'no-cache')
-        self.send_header('Expires', '0')
+        # Dados revalidam a cada uso (304 barato); assets estáticos ficam em cache
+        cache_control = politica_cache(self.path)
+        if cache_control:
+            self.send_header('Cache-Control', cache_control)
+        # Resposta depende do Accept-Encoding (variantes pré-comprimidas)
+        self.send_header('Vary', 'Accept-Encoding')
         super().end_headers()
 
-def start_server():
+def start_server(host=HOST, porta=PORT, abrir_navegador=True):
     """Inicia o servidor HTTP local"""
     # Verificar se estamos no diretório correto
     if not Path('index.html').exists():
@@ -37,32 +226,43 @@ def start_server():
         return
     
     try:
-        with socketserver.TCPServer(("", PORT), CustomHTTPRequestHandler) as httpd:
+        # Uma thread por conexão: um cliente lento não bloqueia os demais
+        with http.server.ThreadingHTTPServer((host, porta), CustomHTTPRequestHandler) as httpd:
+            url = f"http://{host or 'localhost'}:{porta}"
             print("=" * 60)
             print("SERVIDOR WEB INICIADO")
             print("=" * 60)
-            print(f"URL: http://localhost:{PORT}")
+            print(f"URL: {url}")
             print(f"Diretorio: {os.getcwd()}")
             print("=" * 60)
-            print("Abrindo navegador...")
-            print("=" * 60)
             print("Para parar o servidor: Ctrl+C")
             print("=" * 60)
             
             # Abrir navegador automaticamente
-            webbrowser.open(f'http://localhost:{PORT}')
+            if abrir_navegador:
+                print("Abrindo navegador...")
+                webbrowser.open(url)
             
             # Iniciar servidor
             httpd.serve_forever()
-            
+    
     except KeyboardInterrupt:
         print("\n\nServidor parado pelo usuario")
     except OSError as e:
         if e.errno == 98:  # Address already in use
-            print(f"Erro: Porta {PORT} ja esta em uso")
-            print("Tente fechar outros servidores ou use uma porta diferente")
+            print(f"Erro: Porta {porta} ja esta em uso")
+            print("Tente fechar outros servidores ou use uma porta diferente (--porta)")
         else:
             print(f"Erro ao iniciar servidor: {e}")
 
+def main():
+    """Lê porta/endereço da linha de comando (ou das variáveis PORT e HOST)"""
+    parser = argparse.ArgumentParser(description="Servidor local do site do Brasileirão")
+    parser.add_argument("--porta", type=int, default=PORT, help="porta HTTP (padrão: $PORT ou 8000)")
+    parser.add_argument("--host", default=HOST, help="endereço de escuta (padrão: $HOST ou todas as interfaces)")
+    parser.add_argument("--sem-navegador", action="store_true", help="não abre o navegador ao iniciar")
+    args = parser.parse_args()
+    start_server(args.host, args.porta, abrir_navegador=not args.sem_navegador)
+
 if __name__ == "__main__":
-    start_server()
+    main()
@@ -21,11 +21,34 @@ import time
 import random
 import numpy as np
 import os
-import statistics
+import math
+import hashlib
+import argparse
+import threading
+import multiprocessing
+import sqlite3
+import gzip
+import sys
+import cProfile
+import pstats
+import contextvars
+from contextlib import closing, contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from itertools import permutations
 from collections import defaultdict
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+
+try:
+    import brotli  # Opcional: gera também a variante .br dos artefatos web
+except ImportError:
+    brotli = None
+
+try:
+    import resource  # Pico de RSS fora do Linux (indisponível no Windows)
+except ImportError:
+    resource = None
 
 # =============================================================================
 # CONFIGURAÇÕES GERAIS
@@ -82,6 +105,82 @@ SERIE_B_TEAMS = {
     "Volta Redonda": {"idTeam": "138060", "strTeam": "Volta Redonda"},
 }
 
+# Ligas na API e ingestão por rodada
+LIGAS = {
+    "serie_a": {"idLeague": "4351", "strLeague": "Brazilian Serie A"},
+    "serie_b": {"idLeague": "4404", "strLeague": "Brazilian Serie B"},
+}
+TEMPORADA_API = "2025"
+NUM_RODADAS = 38
+MODO_INGESTAO = "rodadas"   # "rodadas" (por rodada, incremental) ou "confrontos" (busca por par de times)
+DIAS_RODADA_RECENTE = 3     # Rodadas com jogos mais recentes que isso ainda são reconsultadas
+STATUS_FINALIZADO = {"Match Finished", "FT", "AET", "PEN"}
+
+# Parâmetros de rede (cota da API compartilhada entre todas as threads)
+REQUISICOES_POR_SEGUNDO = 2.0
+RAJADA_REQUISICOES = 2
+MAX_CONEXOES = 8          # Threads de busca e conexões keep-alive
+TIMEOUT_REQUISICAO = 10
+
+# Cache de respostas HTTP em disco (TTL em segundos por endpoint)
+DIRETORIO_CACHE_HTTP = Path("data/cache_http")
+TTL_ENDPOINTS = {
+    "eventsnext.php": 3 * 3600,
+    "eventsday.php": 3600,
+    "eventsround.php": 3600,
+    "eventsseason.php": 6 * 3600,
+    "eventslast.php": 3600,
+    "searchevents.php": 6 * 3600,
+}
+TTL_PADRAO = 3600
+ENDPOINTS_JANELA = {"eventslast.php", "eventsnext.php"}  # Listas móveis: sempre expiram pelo TTL
+TTL_JOGO_EM_ANDAMENTO = 300  # Respostas com jogo já iniciado e sem resultado final expiram rápido
+MODO_REPLAY = os.environ.get("BRASILEIRAO_REPLAY") == "1"  # Só respostas gravadas, nenhuma chamada de rede
+
+# Armazenamento dos eventos: "json" (cache_jogos_*.json) ou "sqlite" (banco com índices, JSON exportado)
+BACKEND_CACHE = os.environ.get("BRASILEIRAO_BACKEND", "json")
+ARQUIVO_BANCO = Path("data/eventos.db")
+
+# Campos do evento guardados no cache e nos artefatos (o restante do payload da API é descartado)
+CAMPOS_EVENTO = (
+    "idEvent", "idLeague", "strLeague", "strSeason", "intRound",
+    "idHomeTeam", "strHomeTeam", "idAwayTeam", "strAwayTeam", "intHomeScore", "intAwayScore",
+    "dateEvent", "strTime", "strTimestamp", "strStatus", "strPostponed",
+)
+GUARDAR_MIDIA_EVENTOS = False  # Guarda os demais campos (mídia, descrições) em data/midia_eventos_*.json
+
+# Parâmetros da simulação
+NUM_SIMULACOES = 300000
+MOTOR_SIMULACAO = "acumulador"  # "python" (laço original), "numpy" (vetorizado) ou "acumulador"
+TAMANHO_BLOCO = 10000           # Simulações sorteadas por vez nos motores vetorizados
+WORKERS_SIMULACAO = 1           # Processos do modo acumulador (0 = todos os núcleos)
+TOLERANCIA_SIMULACAO = None     # Margem de erro alvo em p.p. (None = número fixo de simulações)
+LOTE_ADAPTATIVO = 20000         # Simulações por lote no modo adaptativo
+Z_CONFIANCA = 1.96              # Intervalo de confiança de 95%
+
+# Séries em paralelo: busca (rede) em threads, simulação (CPU) em processos
+PIPELINE_CONCORRENTE = True
+
+# Instrumentação: --profile grava um .pstats por estágio executado
+PERFILAR_ESTAGIOS = False
+DIRETORIO_PERFIS = Path("data/perfis")
+
+# Versão do modelo/artefatos: incremente para invalidar o cache de estágios
+VERSAO_ESTAGIOS = 2
+
+# Zonas da tabela (posições finais)
+ZONA_LIBERTADORES = 6   # 6 primeiros (Série A)
+ZONA_ACESSO = 4         # 4 primeiros sobem (Série B)
+ZONA_REBAIXAMENTO = 17  # 4 últimos caem
+ZONAS_WEB = ("titulo", "libertadores", "acesso_serie_a", "rebaixamento")
+ZONAS_SERIE = {  # Zonas que valem em cada série (alavancagem, parada do modo adaptativo)
+    "serie_a": ("titulo", "libertadores", "rebaixamento"),
+    "serie_b": ("titulo", "acesso_serie_a", "rebaixamento"),
+}
+
+# Alavancagem: resultados com menos simulações que isso não entram na comparação (probabilidade ruidosa)
+MIN_OCORRENCIAS_ALAVANCAGEM = 200
+
 # =============================================================================
 # FUNÇÕES UTILITÁRIAS
 # =============================================================================
@@ -92,23 +191,537 @@ def log_message(message, color=""):
     print(f"[{timestamp}] {message}")
 
 def carregar_cache(serie):
-    """Carrega cache de jogos"""
+    """Carrega cache de jogos (índice idEvent -> evento)"""
+    if BACKEND_CACHE == "sqlite":
+        return carregar_eventos_banco(serie)
+    return carregar_cache_json(serie)
+
+def salvar_cache(cache_data, serie):
+    """Salva cache de jogos"""
+    if BACKEND_CACHE == "sqlite":
+        gravar_eventos_banco(cache_data, serie)
+    else:
+        salvar_cache_json(cache_data, serie)
+
+def carregar_cache_json(serie):
+    """Lê o arquivo cache_jogos_{serie}.json"""
     cache_file = Path(f"data/cache_jogos_{serie}.json")
     if cache_file.exists():
         with open(cache_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+            cache = json.load(f)
+        contar_arquivo(cache_file, "bytes_lidos")
+        # Formato antigo (listas por confronto) é convertido na leitura
+        return migrar_cache(cache) if cache_legado(cache) else cache
     return {}
 
-def salvar_cache(cache_data, serie):
-    """Salva cache de jogos"""
+def salvar_cache_json(cache_data, serie):
+    """Grava o arquivo cache_jogos_{serie}.json"""
     cache_file = Path(f"data/cache_jogos_{serie}.json")
     with open(cache_file, 'w', encoding='utf-8') as f:
         json.dump(cache_data, f, indent=2, ensure_ascii=False)
+    contar_arquivo(cache_file, "bytes_gravados")
+
+def chave_evento(evento):
+    """Chave do evento no cache: idEvent (ou confronto + data, se a API não informar)"""
+    if evento.get('idEvent'):
+        return str(evento['idEvent'])
+    return f"{evento.get('strHomeTeam')}_vs_{evento.get('strAwayTeam')}_{evento.get('dateEvent')}"
+
+def projetar_evento(evento):
+    """Evento reduzido aos CAMPOS_EVENTO (ids, times, placar, rodada, data, status)"""
+    return {campo: evento.get(campo) for campo in CAMPOS_EVENTO}
+
+def extrair_midia(evento):
+    """Campos fora da projeção que têm valor (pôsteres, escudos, descrições...)"""
+    return {campo: valor for campo, valor in evento.items()
+            if campo not in CAMPOS_EVENTO and valor not in (None, "")}
+
+def carregar_midia(serie):
+    """Carrega o armazenamento à parte dos campos de mídia (idEvent -> campos)"""
+    arquivo = Path(f"data/midia_eventos_{serie}.json")
+    if arquivo.exists():
+        contar_arquivo(arquivo, "bytes_lidos")
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+def salvar_midia(midia, serie):
+    """Salva o armazenamento de mídia (compacto: raramente é lido)"""
+    with open(f"data/midia_eventos_{serie}.json", 'w', encoding='utf-8') as f:
+        json.dump(midia, f, ensure_ascii=False, separators=(',', ':'))
+    contar_arquivo(f"data/midia_eventos_{serie}.json", "bytes_gravados")
+
+def registrar_evento(cache, evento, midia=None):
+    """Upsert por idEvent: insere jogo novo ou atualiza no lugar (ex.: jogo agendado que ganhou placar)
+    
+    O evento é guardado projetado; com `midia` os demais campos vão para esse dicionário.
+    Um evento já com placar não é substituído por uma versão sem placar.
+    Retorna True se o cache mudou.
+    """
+    chave = chave_evento(evento)
+    if midia is not None:
+        extras = extrair_midia(evento)
+        if extras:
+            midia[chave] = extras
+    evento = projetar_evento(evento)
+    atual = cache.get(chave)
+    if atual == evento:
+        return False
+    if (atual is not None and atual.get('intHomeScore') is not None
+            and evento.get('intHomeScore') is None):
+        return False
+    cache[chave] = evento
+    return True
+
+def cache_legado(cache):
+    """True se o cache está no formato antigo ({"Casa_vs_Fora": [eventos]} ou eventos completos da API)"""
+    return any(isinstance(valor, list) or valor.keys() != set(CAMPOS_EVENTO) for valor in cache.values())
+
+def iterar_eventos(cache):
+    """Percorre os eventos do cache em qualquer um dos formatos"""
+    for valor in cache.values():
+        if isinstance(valor, list):
+            yield from valor
+        elif isinstance(valor, dict):
+            yield valor
+
+def migrar_cache(cache, midia=None):
+    """Converte o formato antigo em índice por idEvent de eventos projetados, eliminando duplicatas"""
+    indice = {}
+    for evento in iterar_eventos(cache):
+        registrar_evento(indice, evento, midia)
+    return indice
+
+def migrar_cache_arquivo(serie):
+    """Compacta uma vez o arquivo de cache no formato antigo (sem efeito se já migrado)"""
+    cache_file = Path(f"data/cache_jogos_{serie}.json")
+    if not cache_file.exists():
+        return False
+    with open(cache_file, 'r', encoding='utf-8') as f:
+        cache = json.load(f)
+    if not cache_legado(cache):
+        return False
+    
+    total_antes = sum(1 for _ in iterar_eventos(cache))
+    tamanho_antes = cache_file.stat().st_size
+    midia = carregar_midia(serie) if GUARDAR_MIDIA_EVENTOS else None
+    indice = migrar_cache(cache, midia)
+    salvar_cache_json(indice, serie)
+    if midia is not None:
+        salvar_midia(midia, serie)
+    log_message(f"Cache da {serie.upper()} migrado: {total_antes} eventos -> {len(indice)} únicos "
+                f"({tamanho_antes // 1024} KB -> {cache_file.stat().st_size // 1024} KB)")
+    return True
 
 def limpar_tela():
     """Limpa a tela do terminal"""
     os.system('cls' if os.name == 'nt' else 'clear')
 
+# =============================================================================
+# INSTRUMENTAÇÃO DOS ESTÁGIOS
+# =============================================================================
+
+# Contadores somados pelo cliente HTTP, pelo limitador e pela E/S de arquivos do estágio em andamento
+CONTADORES_ESTAGIO = (
+    "requisicoes_http", "falhas_http", "retentativas", "acertos_cache_http",
+    "espera_limite_taxa", "bytes_recebidos", "bytes_lidos", "bytes_gravados", "simulacoes",
+)
+
+_medicao_atual = contextvars.ContextVar("medicao_atual", default=None)
+
+class MedicaoEstagio:
+    """Contadores (e perfis, com --profile) de um estágio; as threads de busca somam no mesmo objeto"""
+    
+    def __init__(self, perfilar=False):
+        self.contadores = dict.fromkeys(CONTADORES_ESTAGIO, 0)
+        self.perfilar = perfilar
+        self.perfis = []
+        self.lock = threading.Lock()
+    
+    def somar(self, nome, valor=1):
+        with self.lock:
+            self.contadores[nome] += valor
+    
+    def adicionar_perfil(self, perfil):
+        with self.lock:
+            self.perfis.append(perfil)
+
+def definir_perfilamento(ativo):
+    """Ativa/desativa o --profile (um arquivo .pstats por estágio executado)"""
+    global PERFILAR_ESTAGIOS
+    PERFILAR_ESTAGIOS = ativo
+
+def contar(nome, valor=1):
+    """Soma `valor` ao contador do estágio em andamento (sem efeito fora de um estágio)"""
+    medicao = _medicao_atual.get()
+    if medicao is not None:
+        medicao.somar(nome, valor)
+
+def contar_arquivo(caminho, contador):
+    """Soma o tamanho de um arquivo lido/gravado a bytes_lidos ou bytes_gravados"""
+    try:
+        contar(contador, os.path.getsize(caminho))
+    except OSError:
+        pass
+
+def iniciar_perfil():
+    """cProfile já ativado, ou None se outro perfil estiver ativo (Python 3.12+ aceita um por processo)"""
+    perfil = cProfile.Profile()
+    try:
+        perfil.enable()
+    except ValueError:
+        return None
+    return perfil
+
+def executar_com_perfil(funcao, *args):
+    """Chama a função; com --profile ativo no estágio, perfila esta thread à parte"""
+    medicao = _medicao_atual.get()
+    perfil = iniciar_perfil() if medicao is not None and medicao.perfilar else None
+    if perfil is None:
+        return funcao(*args)
+    try:
+        return funcao(*args)
+    finally:
+        perfil.disable()
+        medicao.adicionar_perfil(perfil)
+
+def mapear_em_threads(funcao, itens, max_workers=MAX_CONEXOES):
+    """executor.map que leva a medição do estágio em andamento para as threads de busca"""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futuros = [executor.submit(contextvars.copy_context().run, executar_com_perfil, funcao, item)
+                   for item in itens]
+        return [futuro.result() for futuro in futuros]
+
+def tempo_cpu():
+    """CPU (usuário + sistema) do processo e dos processos filhos já encerrados"""
+    tempos = os.times()
+    return tempos.user + tempos.system + tempos.children_user + tempos.children_system
+
+def zerar_pico_memoria():
+    """Zera o pico de RSS do processo (Linux); False se o sistema não permitir"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+def pico_memoria_mb():
+    """Pico de RSS do processo em MB (VmHWM no Linux, senão ru_maxrss); None se indisponível"""
+    try:
+        with open("/proc/self/status") as f:
+            for linha in f:
+                if linha.startswith("VmHWM:"):
+                    return int(linha.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is not None:
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return pico / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return None
+
+def salvar_perfil(perfis, nome, serie):
+    """Junta os perfis do estágio (thread principal + threads de busca) em data/perfis/{estagio}_{serie}.pstats"""
+    DIRETORIO_PERFIS.mkdir(parents=True, exist_ok=True)
+    arquivo = DIRETORIO_PERFIS / f"{nome}_{serie}.pstats"
+    pstats.Stats(*perfis).dump_stats(arquivo)
+    return str(arquivo)
+
+@contextmanager
+def medir_estagio(nome, serie, relatorio, entrada_registro=None):
+    """Mede o bloco como um estágio e acrescenta o item em `relatorio`
+    
+    Registra tempo de parede, CPU, pico de RSS e os CONTADORES_ESTAGIO. CPU e
+    pico de RSS são do processo inteiro: no pipeline concorrente, as buscas das
+    duas séries rodam juntas e dividem esses dois números (os contadores não).
+    Com `entrada_registro` (dict), as métricas também vão para o registro de
+    estágios da série (data/estagios_{serie}.json), junto com essa entrada.
+    """
+    medicao = MedicaoEstagio(PERFILAR_ESTAGIOS)
+    token = _medicao_atual.set(medicao)
+    item = {'estagio': nome, 'serie': serie, 'reutilizado': False}
+    pico_do_estagio = zerar_pico_memoria()
+    inicio, cpu_inicio = time.perf_counter(), tempo_cpu()
+    perfil = iniciar_perfil() if medicao.perfilar else None
+    try:
+        yield item
+    finally:
+        if perfil:
+            perfil.disable()
+            medicao.adicionar_perfil(perfil)
+        _medicao_atual.reset(token)
+    
+    pico = pico_memoria_mb()
+    item.update({
+        'duracao': round(time.perf_counter() - inicio, 3),
+        'cpu': round(tempo_cpu() - cpu_inicio, 3),
+        'pico_rss_mb': round(pico, 1) if pico is not None else None,
+        'pico_rss_do_estagio': pico_do_estagio,  # False: pico desde o início do processo
+        **medicao.contadores,
+    })
+    item['espera_limite_taxa'] = round(item['espera_limite_taxa'], 3)
+    if medicao.perfis:
+        item['perfil'] = salvar_perfil(medicao.perfis, nome, serie)
+    relatorio.append(item)
+    
+    if entrada_registro is not None:
+        metricas = {chave: valor for chave, valor in item.items() if chave not in ('estagio', 'serie', 'reutilizado')}
+        gravar_registro_estagio(serie, nome, {**entrada_registro, 'data': datetime.now().isoformat(), **metricas})
+
+# =============================================================================
+# BANCO DE EVENTOS (SQLITE)
+# =============================================================================
+
+ESQUEMA_BANCO = """
+CREATE TABLE IF NOT EXISTS eventos (
+    id_evento TEXT PRIMARY KEY,
+    serie TEXT NOT NULL,
+    liga TEXT,
+    temporada TEXT,
+    rodada INTEGER,
+    mandante TEXT,
+    visitante TEXT,
+    data TEXT,
+    gols_mandante INTEGER,
+    gols_visitante INTEGER,
+    evento TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_eventos_serie ON eventos (serie);
+CREATE INDEX IF NOT EXISTS idx_eventos_liga_rodada ON eventos (liga, temporada, rodada);
+CREATE INDEX IF NOT EXISTS idx_eventos_liga_data ON eventos (liga, data);
+CREATE INDEX IF NOT EXISTS idx_eventos_mandante ON eventos (mandante, data);
+CREATE INDEX IF NOT EXISTS idx_eventos_visitante ON eventos (visitante, data);
+"""
+
+# Só reescreve a linha se o JSON do evento mudou; placar nunca volta a ficar vazio
+SQL_UPSERT_EVENTO = """
+INSERT INTO eventos (id_evento, serie, liga, temporada, rodada, mandante, visitante, data,
+                     gols_mandante, gols_visitante, evento)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id_evento) DO UPDATE SET
+    serie = excluded.serie, liga = excluded.liga, temporada = excluded.temporada,
+    rodada = excluded.rodada, mandante = excluded.mandante, visitante = excluded.visitante,
+    data = excluded.data, gols_mandante = excluded.gols_mandante,
+    gols_visitante = excluded.gols_visitante, evento = excluded.evento
+WHERE eventos.evento != excluded.evento
+  AND NOT (eventos.gols_mandante IS NOT NULL AND excluded.gols_mandante IS NULL)
+"""
+
+def definir_backend_cache(backend):
+    """Escolhe onde os eventos são guardados ("json" ou "sqlite")"""
+    global BACKEND_CACHE
+    BACKEND_CACHE = backend
+
+def conectar_banco():
+    """Abre o banco de eventos em modo WAL, criando tabela e índices se preciso"""
+    ARQUIVO_BANCO.parent.mkdir(parents=True, exist_ok=True)
+    conexao = sqlite3.connect(ARQUIVO_BANCO)
+    conexao.execute("PRAGMA journal_mode=WAL")
+    conexao.execute("PRAGMA synchronous=NORMAL")
+    conexao.executescript(ESQUEMA_BANCO)
+    return conexao
+
+def linha_evento(chave, evento, serie):
+    """Colunas indexadas + JSON completo de um evento"""
+    def inteiro(valor):
+        return int(valor) if valor not in (None, "") else None
+    return (
+        chave, serie, evento.get('strLeague'), evento.get('strSeason'), inteiro(evento.get('intRound')),
+        evento.get('strHomeTeam'), evento.get('strAwayTeam'), evento.get('dateEvent'),
+        inteiro(evento.get('intHomeScore')), inteiro(evento.get('intAwayScore')),
+        json.dumps(evento, ensure_ascii=False, sort_keys=True)
+    )
+
+def gravar_eventos_banco(cache, serie):
+    """Upsert por idEvent de todos os eventos do cache (linhas inalteradas não são tocadas)"""
+    linhas = [linha_evento(chave, evento, serie) for chave, evento in cache.items() if isinstance(evento, dict)]
+    with closing(conectar_banco()) as conexao, conexao:
+        antes = conexao.total_changes
+        conexao.executemany(SQL_UPSERT_EVENTO, linhas)
+        return conexao.total_changes - antes
+
+def carregar_eventos_banco(serie):
+    """Cache da série lido do banco, na ordem de inserção"""
+    with closing(conectar_banco()) as conexao:
+        linhas = conexao.execute(
+            "SELECT id_evento, evento FROM eventos WHERE serie = ? ORDER BY rowid", (serie,)
+        ).fetchall()
+    return {chave: json.loads(evento) for chave, evento in linhas}
+
+def importar_cache_json(serie):
+    """Popula o banco a partir do cache JSON na primeira execução com SQLite"""
+    with closing(conectar_banco()) as conexao:
+        existentes = conexao.execute("SELECT COUNT(*) FROM eventos WHERE serie = ?", (serie,)).fetchone()[0]
+    if existentes:
+        return 0
+    cache = carregar_cache_json(serie)
+    if cache:
+        gravar_eventos_banco(cache, serie)
+        log_message(f"Banco de eventos: {len(cache)} eventos da {serie.upper()} importados do JSON")
+    return len(cache)
+
+def exportar_cache_json(serie):
+    """Exporta o banco para cache_jogos_{serie}.json (formato lido pelo site estático)"""
+    cache = carregar_eventos_banco(serie)
+    salvar_cache_json(cache, serie)
+    return len(cache)
+
+def consultar_colunas_temporada(serie):
+    """Colunas dos jogos da liga via índice (liga, temporada, rodada), na ordem de inserção"""
+    league = LIGAS[serie]['strLeague']
+    with closing(conectar_banco()) as conexao:
+        return conexao.execute(
+            "SELECT mandante, visitante, gols_mandante, gols_visitante, rodada, data FROM eventos "
+            "WHERE liga = ? AND mandante IS NOT NULL AND visitante IS NOT NULL "
+            "AND mandante != '' AND visitante != '' ORDER BY rowid",
+            (league,)
+        ).fetchall()
+
+# =============================================================================
+# CLIENTE HTTP (SESSÃO COMPARTILHADA E LIMITE DE TAXA)
+# =============================================================================
+
+class LimitadorTaxa:
+    """Token bucket thread-safe: até `taxa` requisições/s, com rajadas de `capacidade`"""
+    
+    def __init__(self, taxa, capacidade):
+        self.taxa = taxa
+        self.capacidade = capacidade
+        self.tokens = float(capacidade)
+        self.ultimo = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def aguardar(self):
+        """Bloqueia até haver um token disponível"""
+        while True:
+            with self.lock:
+                agora = time.monotonic()
+                self.tokens = min(self.capacidade, self.tokens + (agora - self.ultimo) * self.taxa)
+                self.ultimo = agora
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                espera = (1 - self.tokens) / self.taxa
+            time.sleep(espera)
+            contar("espera_limite_taxa", espera)
+
+_limitador = LimitadorTaxa(REQUISICOES_POR_SEGUNDO, RAJADA_REQUISICOES)
+_sessao = None
+_sessao_lock = threading.Lock()
+
+def obter_sessao():
+    """Sessão HTTP única com pool de conexões keep-alive"""
+    global _sessao
+    with _sessao_lock:
+        if _sessao is None:
+            _sessao = requests.Session()
+            adaptador = HTTPAdapter(pool_connections=MAX_CONEXOES, pool_maxsize=MAX_CONEXOES)
+            _sessao.mount("https://", adaptador)
+            _sessao.mount("http://", adaptador)
+        return _sessao
+
+def definir_modo_replay(ativo):
+    """Ativa/desativa o modo replay (respostas só do cache HTTP em disco)"""
+    global MODO_REPLAY
+    MODO_REPLAY = ativo
+
+def arquivo_cache_http(url):
+    """Caminho do arquivo de cache de uma URL"""
+    return DIRETORIO_CACHE_HTTP / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+def resposta_finalizada(data):
+    """True se a resposta só contém jogos encerrados (não muda mais)"""
+    eventos = []
+    for chave in ("event", "events", "results"):
+        eventos.extend(data.get(chave) or [])
+    return bool(eventos) and all(
+        evento.get('intHomeScore') is not None and evento.get('intAwayScore') is not None
+        and evento.get('strStatus') in STATUS_FINALIZADO
+        for evento in eventos
+    )
+
+def inicio_evento(evento):
+    """Horário de início do evento em UTC (strTimestamp), ou None se ausente/inválido"""
+    try:
+        inicio = datetime.fromisoformat(evento.get('strTimestamp') or "")
+    except ValueError:
+        return None
+    return inicio.replace(tzinfo=timezone.utc) if inicio.tzinfo is None else inicio.astimezone(timezone.utc)
+
+def resposta_em_andamento(data, agora=None):
+    """True se algum jogo da resposta já começou e ainda não tem resultado final"""
+    agora = agora or datetime.now(timezone.utc)
+    for chave in ("event", "events", "results"):
+        for evento in data.get(chave) or []:
+            inicio = inicio_evento(evento)
+            if (inicio is not None and inicio <= agora
+                    and evento.get('strStatus') not in STATUS_FINALIZADO
+                    and evento.get('strPostponed') != "yes"):
+                return True
+    return False
+
+def ttl_resposta(url, data):
+    """TTL da resposta: None (nunca expira) para jogos encerrados, curto com jogo em andamento, senão o do endpoint"""
+    endpoint = url.split("?")[0].rsplit("/", 1)[-1]
+    if endpoint not in ENDPOINTS_JANELA and resposta_finalizada(data):
+        return None
+    ttl = TTL_ENDPOINTS.get(endpoint, TTL_PADRAO)
+    if resposta_em_andamento(data):
+        return min(ttl, TTL_JOGO_EM_ANDAMENTO)
+    return ttl
+
+def ler_cache_http(url):
+    """Lê a resposta gravada de uma URL (ou None)"""
+    arquivo = arquivo_cache_http(url)
+    if not arquivo.exists():
+        return None
+    try:
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            entrada = json.load(f)
+    except (OSError, ValueError):
+        return None
+    contar_arquivo(arquivo, "bytes_lidos")
+    return entrada
+
+def gravar_cache_http(url, data):
+    """Grava a resposta de uma URL de forma atômica"""
+    DIRETORIO_CACHE_HTTP.mkdir(parents=True, exist_ok=True)
+    arquivo = arquivo_cache_http(url)
+    temporario = arquivo.with_suffix(f".{threading.get_ident()}.tmp")
+    entrada = {"url": url, "salvo_em": time.time(), "ttl": ttl_resposta(url, data), "resposta": data}
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(entrada, f, ensure_ascii=False)
+    os.replace(temporario, arquivo)
+    contar_arquivo(arquivo, "bytes_gravados")
+
+def requisitar_json(url, timeout=TIMEOUT_REQUISICAO):
+    """GET com cache em disco e limite global de taxa; retorna o JSON ou None em caso de erro"""
+    entrada = ler_cache_http(url)
+    if entrada is not None:
+        ttl = entrada.get("ttl")
+        if MODO_REPLAY or ttl is None or time.time() - entrada.get("salvo_em", 0) < ttl:
+            contar("acertos_cache_http")
+            return entrada["resposta"]
+    if MODO_REPLAY:
+        return None
+    
+    _limitador.aguardar()
+    contar("requisicoes_http")
+    try:
+        response = obter_sessao().get(url, timeout=timeout)
+        contar("bytes_recebidos", len(response.content))
+        if response.status_code == 200:
+            data = response.json()
+            if isinstance(data, dict):
+                gravar_cache_http(url, data)
+            return data
+    except Exception:
+        pass
+    contar("falhas_http")
+    
+    # Falha de rede: uma resposta expirada ainda é melhor que nenhuma
+    return entrada["resposta"] if entrada is not None else None
+
 # =============================================================================
 # BUSCA DE JOGOS
 # =============================================================================
@@ -125,38 +738,31 @@ def buscar_jogo_api(home, away, teams_info, serie):
     # Primeira tentativa: busca por nome
     url = f"{BASE_URL}/searchevents.php?e={home_name}_vs_{away_name}&s=2025&f={league_filter}"
     
-    try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            data = response.json()
-            eventos = data.get("event", [])
-            if eventos:
-                eventos_filtrados = [jogo for jogo in eventos if jogo.get("strLeague") == league]
-                if eventos_filtrados:
-                    return eventos_filtrados
-    except:
-        pass
+    data = requisitar_json(url)
+    if data:
+        eventos = data.get("event", [])
+        if eventos:
+            eventos_filtrados = [jogo for jogo in eventos if jogo.get("strLeague") == league]
+            if eventos_filtrados:
+                return eventos_filtrados
     
     # Segunda tentativa: busca por ID do time
+    contar("retentativas")
     home_id = teams_info[home]["idTeam"]
     away_id = teams_info[away]["idTeam"]
     
     for team_id, team_name in [(home_id, home_name), (away_id, away_name)]:
-        try:
-            url_last = f"{BASE_URL}/eventslast.php?id={team_id}"
-            response = requests.get(url_last)
+        url_last = f"{BASE_URL}/eventslast.php?id={team_id}"
+        data = requisitar_json(url_last)
+        
+        if data:
+            results = data.get("results") or []
             
-            if response.status_code == 200:
-                data = response.json()
-                results = data.get("results", [])
-                
-                for jogo in results:
-                    if (jogo.get("strHomeTeam") == home_name and 
-                        jogo.get("strAwayTeam") == away_name and 
-                        jogo.get("strLeague") == league):
-                        return [jogo]
-        except:
-            continue
+            for jogo in results:
+                if (jogo.get("strHomeTeam") == home_name and 
+                    jogo.get("strAwayTeam") == away_name and 
+                    jogo.get("strLeague") == league):
+                    return [jogo]
     
     return None
 
@@ -168,18 +774,23 @@ def buscar_jogos_serie(serie):
     team_names = list(teams_info.keys())
     
     cache = carregar_cache(serie)
+    midia = carregar_midia(serie) if GUARDAR_MIDIA_EVENTOS else None
     tabela = defaultdict(lambda: {
         "pontos": 0, "jogos": 0, "vitorias": 0,
         "empates": 0, "derrotas": 0, "gp": 0, "gc": 0
     })
     
     contador_jogos = defaultdict(int)
-    total_combinations = len(list(permutations(team_names, 2)))
+    pares = list(permutations(team_names, 2))
+    total_combinations = len(pares)
+    
+    # Buscas em paralelo (limitadas pela cota global); resultados processados em ordem
+    log_message(f"Consultando {total_combinations} confrontos com {MAX_CONEXOES} conexões...")
+    respostas = mapear_em_threads(lambda par: buscar_jogo_api(par[0], par[1], teams_info, serie), pares)
     
-    for i, (home, away) in enumerate(permutations(team_names, 2)):
+    for i, ((home, away), jogos) in enumerate(zip(pares, respostas)):
         log_message(f"Processando {i+1}/{total_combinations}: {home} vs {away}")
         
-        jogos = buscar_jogo_api(home, away, teams_info, serie)
         if not jogos:
             continue
         
@@ -225,28 +836,124 @@ def buscar_jogos_serie(serie):
                     tabela[casa]["empates"] += 1
                     tabela[fora]["empates"] += 1
                 
-                # Salvar no cache
-                key = f"{casa}_vs_{fora}"
-                if key not in cache:
-                    cache[key] = []
-                cache[key].append(jogo)
+                # Salvar no cache (upsert por idEvent)
+                registrar_evento(cache, jogo, midia)
                 
             except Exception as e:
                 continue
-        
-        time.sleep(0.5)  # Rate limiting
     
     # Salvar cache
     salvar_cache(cache, serie)
+    if midia is not None:
+        salvar_midia(midia, serie)
     
     log_message(f"Busca da {serie.upper()} concluída!")
     return cache
 
+def carregar_estado_rodadas(serie):
+    """Carrega quais rodadas já estão completas e finais no cache"""
+    arquivo = Path(f"data/rodadas_{serie}.json")
+    if arquivo.exists():
+        contar_arquivo(arquivo, "bytes_lidos")
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {"finalizadas": [], "atualizado_em": None}
+
+def salvar_estado_rodadas(estado, serie):
+    """Salva o estado das rodadas"""
+    with open(f"data/rodadas_{serie}.json", 'w', encoding='utf-8') as f:
+        json.dump(estado, f, ensure_ascii=False, indent=2)
+    contar_arquivo(f"data/rodadas_{serie}.json", "bytes_gravados")
+
+def rodada_finalizada(eventos, agora=None):
+    """Uma rodada é final quando todos os jogos terminaram (não adiados) há mais de DIAS_RODADA_RECENTE dias"""
+    if not eventos:
+        return False
+    agora = agora or datetime.now()
+    limite = (agora - timedelta(days=DIAS_RODADA_RECENTE)).strftime("%Y-%m-%d")
+    for evento in eventos:
+        if (evento.get('intHomeScore') is None or evento.get('intAwayScore') is None
+                or evento.get('strStatus') not in STATUS_FINALIZADO
+                or evento.get('strPostponed') == "yes"
+                or (evento.get('dateEvent') or "") > limite):
+            return False
+    return True
+
+def rodadas_finalizadas_no_cache(cache, rodadas):
+    """Das rodadas dadas, as que o cache ainda tem com todos os jogos finais"""
+    por_rodada = defaultdict(list)
+    for evento in cache.values():
+        por_rodada[str(evento.get('intRound'))].append(evento)
+    return {rodada for rodada in rodadas if rodada_finalizada(por_rodada[str(rodada)])}
+
+def buscar_rodadas_serie(serie, temporada_completa=False):
+    """Ingestão por rodada: só reconsulta rodadas ainda não finalizadas
+    
+    Com temporada_completa=True (ou sem estado salvo) faz antes uma carga da
+    temporada inteira em uma única requisição. O estado salvo só vale se o cache
+    ainda tiver os eventos das rodadas que ele marca como finalizadas.
+    """
+    log_message(f"Buscando rodadas da {serie.upper()}...")
+    
+    liga = LIGAS[serie]
+    cache = carregar_cache(serie)
+    midia = carregar_midia(serie) if GUARDAR_MIDIA_EVENTOS else None
+    estado = carregar_estado_rodadas(serie)
+    finalizadas = rodadas_finalizadas_no_cache(cache, estado["finalizadas"])
+    if len(finalizadas) < len(estado["finalizadas"]):
+        # Cache apagado ou incompleto (ex.: --clean): o estado não descreve mais o cache
+        log_message(f"  Estado das rodadas descartado: {len(estado['finalizadas']) - len(finalizadas)} "
+                    f"rodada(s) finalizada(s) sem os jogos no cache")
+        finalizadas = set()
+        estado["atualizado_em"] = None
+    alterados = 0
+    
+    if temporada_completa or estado["atualizado_em"] is None:
+        data = requisitar_json(f"{BASE_URL}/eventsseason.php?id={liga['idLeague']}&s={TEMPORADA_API}")
+        for evento in (data or {}).get("events") or []:
+            if evento.get("strLeague") == liga["strLeague"] and evento.get("strHomeTeam") and evento.get("strAwayTeam"):
+                alterados += registrar_evento(cache, evento, midia)
+    
+    pendentes = [r for r in range(1, NUM_RODADAS + 1) if r not in finalizadas]
+    log_message(f"  {len(finalizadas)} rodadas finalizadas no cache; consultando {len(pendentes)} rodadas")
+    
+    urls = [f"{BASE_URL}/eventsround.php?id={liga['idLeague']}&r={r}&s={TEMPORADA_API}" for r in pendentes]
+    respostas = mapear_em_threads(requisitar_json, urls)
+    
+    for rodada, data in zip(pendentes, respostas):
+        if not data:
+            continue
+        eventos = [evento for evento in data.get("events") or []
+                   if evento.get("strLeague") == liga["strLeague"]
+                   and evento.get("strHomeTeam") and evento.get("strAwayTeam")]
+        for evento in eventos:
+            alterados += registrar_evento(cache, evento, midia)
+        if rodada_finalizada(eventos):
+            finalizadas.add(rodada)
+    
+    salvar_cache(cache, serie)
+    if midia is not None:
+        salvar_midia(midia, serie)
+    estado["finalizadas"] = sorted(finalizadas)
+    estado["atualizado_em"] = datetime.now().isoformat()
+    salvar_estado_rodadas(estado, serie)
+    
+    log_message(f"Rodadas da {serie.upper()}: {alterados} eventos novos ou atualizados, "
+                f"{len(finalizadas)}/{NUM_RODADAS} rodadas finalizadas")
+    return cache
+
+def buscar_jogos(serie):
+    """Busca os jogos de uma série pelo modo de ingestão configurado"""
+    if MODO_INGESTAO == "rodadas":
+        return buscar_rodadas_serie(serie)
+    return buscar_jogos_serie(serie)
+
 def buscar_jogos_faltantes(serie):
     """Busca jogos faltantes por data"""
     log_message(f"Buscando jogos faltantes da {serie.upper()}...")
     
     cache = carregar_cache(serie)
+    midia = carregar_midia(serie) if GUARDAR_MIDIA_EVENTOS else None
     league = "Brazilian%20Serie%20A" if serie == "serie_a" else "Brazilian%20Serie%20B"
     
     # Buscar jogos dos últimos 30 dias
@@ -255,36 +962,32 @@ def buscar_jogos_faltantes(serie):
     
     jogos_adicionados = 0
     
+    urls = []
     data_atual = data_inicio
     while data_atual <= data_fim:
         data_str = data_atual.strftime("%Y-%m-%d")
-        
-        try:
-            url = f"{BASE_URL}/eventsday.php?d={data_str}&l={league}"
-            response = requests.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                events = data.get('events', [])
-                
-                for evento in events:
-                    if evento.get('strHomeTeam') and evento.get('strAwayTeam'):
-                        chave = f"{evento['strHomeTeam']}_vs_{evento['strAwayTeam']}"
-                        
-                        if chave not in cache:
-                            cache[chave] = [evento]
-                            jogos_adicionados += 1
-                            log_message(f"  [+] Novo jogo: {evento['strHomeTeam']} vs {evento['strAwayTeam']}")
-        
-        except:
-            pass
-        
-        time.sleep(1)
+        urls.append(f"{BASE_URL}/eventsday.php?d={data_str}&l={league}")
         data_atual += timedelta(days=1)
     
+    respostas = mapear_em_threads(requisitar_json, urls)
+    
+    for data in respostas:
+        if not data:
+            continue
+        
+        for evento in data.get('events') or []:
+            if evento.get('strHomeTeam') and evento.get('strAwayTeam'):
+                novo = chave_evento(evento) not in cache
+                if registrar_evento(cache, evento, midia):
+                    jogos_adicionados += 1
+                    situacao = "Novo jogo" if novo else "Jogo atualizado"
+                    log_message(f"  [+] {situacao}: {evento['strHomeTeam']} vs {evento['strAwayTeam']}")
+    
     if jogos_adicionados > 0:
         salvar_cache(cache, serie)
-        log_message(f"Adicionados {jogos_adicionados} jogos faltantes da {serie.upper()}")
+        if midia is not None:
+            salvar_midia(midia, serie)
+        log_message(f"Adicionados/atualizados {jogos_adicionados} jogos faltantes da {serie.upper()}")
     
     return cache
 
@@ -296,40 +999,147 @@ def buscar_proximos_jogos(serie):
     league = "Brazilian Serie A" if serie == "serie_a" else "Brazilian Serie B"
     
     proximos_jogos = {}
+    midia = carregar_midia(serie) if GUARDAR_MIDIA_EVENTOS else None
     
-    for time_nome, info in teams_info.items():
-        team_id = info["idTeam"]
-        
-        try:
-            url = f"{BASE_URL}/eventsnext.php?id={team_id}"
-            response = requests.get(url)
-            
-            if response.status_code == 200:
-                data = response.json()
-                events = data.get("events", [])
-                
-                jogos_serie = []
-                for evento in events:
-                    if evento.get("strLeague") == league:
-                        jogos_serie.append(evento)
-                
-                proximos_jogos[time_nome] = jogos_serie
-                log_message(f"  {time_nome}: {len(jogos_serie)} jogos encontrados")
-        
-        except Exception as e:
+    urls = [f"{BASE_URL}/eventsnext.php?id={info['idTeam']}" for info in teams_info.values()]
+    respostas = mapear_em_threads(requisitar_json, urls)
+    
+    for time_nome, data in zip(teams_info, respostas):
+        if data is None:
             proximos_jogos[time_nome] = []
+            continue
         
-        time.sleep(0.5)
+        jogos_serie = []
+        for evento in data.get("events") or []:
+            if evento.get("strLeague") == league:
+                if midia is not None and extrair_midia(evento):
+                    midia[chave_evento(evento)] = extrair_midia(evento)
+                jogos_serie.append(projetar_evento(evento))
+        
+        proximos_jogos[time_nome] = jogos_serie
+        log_message(f"  {time_nome}: {len(jogos_serie)} jogos encontrados")
     
     # Salvar próximos jogos
     with open(f'data/proximos_jogos_{serie}.json', 'w', encoding='utf-8') as f:
         json.dump(proximos_jogos, f, ensure_ascii=False, indent=2)
+    contar_arquivo(f'data/proximos_jogos_{serie}.json', "bytes_gravados")
+    if midia is not None:
+        salvar_midia(midia, serie)
     
     total_jogos = sum(len(jogos) for jogos in proximos_jogos.values())
     log_message(f"Total de próximos jogos da {serie.upper()}: {total_jogos}")
     
     return proximos_jogos
 
+# =============================================================================
+# TEMPORADA EM COLUNAS
+# =============================================================================
+
+class Temporada:
+    """Jogos de uma série em colunas NumPy, com tabela nome <-> índice dos times
+    
+    Cada posição dos arrays é um evento da liga no cache: mandante/visitante são
+    índices em `times`, gols valem 0 em jogos não disputados, rodada vale -1
+    quando ausente e data é NaT quando ausente.
+    """
+    
+    def __init__(self, serie, times, mandante, visitante, gols_mandante, gols_visitante,
+                 rodada, data, data_texto, jogado):
+        self.serie = serie
+        self.times = times
+        self.indice_time = {time: i for i, time in enumerate(times)}
+        self.mandante = mandante
+        self.visitante = visitante
+        self.gols_mandante = gols_mandante
+        self.gols_visitante = gols_visitante
+        self.rodada = rodada
+        self.data = data
+        self.data_texto = data_texto
+        self.jogado = jogado
+    
+    def __len__(self):
+        return len(self.mandante)
+
+def carregar_temporada(serie, cache_jogos=None):
+    """Converte o cache de jogos em uma Temporada colunar, numa única passada"""
+    if cache_jogos is None:
+        if BACKEND_CACHE == "sqlite":
+            return carregar_temporada_banco(serie)
+        cache_jogos = carregar_cache(serie)
+    league = "Brazilian Serie A" if serie == "serie_a" else "Brazilian Serie B"
+    
+    indice_time = {}
+    colunas = defaultdict(list)
+    for jogo in iterar_eventos(cache_jogos):
+        mandante = jogo.get('strHomeTeam')
+        visitante = jogo.get('strAwayTeam')
+        if jogo.get('strLeague') != league or not mandante or not visitante:
+            continue
+        
+        gols_mandante = jogo.get('intHomeScore')
+        gols_visitante = jogo.get('intAwayScore')
+        jogado = gols_mandante is not None and gols_visitante is not None
+        rodada = jogo.get('intRound')
+        
+        colunas['mandante'].append(indice_time.setdefault(mandante, len(indice_time)))
+        colunas['visitante'].append(indice_time.setdefault(visitante, len(indice_time)))
+        colunas['gols_mandante'].append(int(gols_mandante) if jogado else 0)
+        colunas['gols_visitante'].append(int(gols_visitante) if jogado else 0)
+        colunas['rodada'].append(int(rodada) if rodada else -1)
+        colunas['data_texto'].append(jogo.get('dateEvent'))
+        colunas['jogado'].append(jogado)
+    
+    return Temporada(
+        serie=serie,
+        times=list(indice_time),
+        mandante=np.array(colunas['mandante'], dtype=np.intp),
+        visitante=np.array(colunas['visitante'], dtype=np.intp),
+        gols_mandante=np.array(colunas['gols_mandante'], dtype=np.int16),
+        gols_visitante=np.array(colunas['gols_visitante'], dtype=np.int16),
+        rodada=np.array(colunas['rodada'], dtype=np.int16),
+        data=np.array([d or 'NaT' for d in colunas['data_texto']], dtype='datetime64[D]'),
+        data_texto=colunas['data_texto'],
+        jogado=np.array(colunas['jogado'], dtype=bool)
+    )
+
+def carregar_temporada_banco(serie):
+    """Temporada montada direto das colunas indexadas do banco, sem decodificar o JSON dos eventos"""
+    indice_time = {}
+    colunas = defaultdict(list)
+    for mandante, visitante, gols_mandante, gols_visitante, rodada, data in consultar_colunas_temporada(serie):
+        jogado = gols_mandante is not None and gols_visitante is not None
+        colunas['mandante'].append(indice_time.setdefault(mandante, len(indice_time)))
+        colunas['visitante'].append(indice_time.setdefault(visitante, len(indice_time)))
+        colunas['gols_mandante'].append(gols_mandante if jogado else 0)
+        colunas['gols_visitante'].append(gols_visitante if jogado else 0)
+        colunas['rodada'].append(rodada if rodada else -1)
+        colunas['data_texto'].append(data)
+        colunas['jogado'].append(jogado)
+    
+    return Temporada(
+        serie=serie,
+        times=list(indice_time),
+        mandante=np.array(colunas['mandante'], dtype=np.intp),
+        visitante=np.array(colunas['visitante'], dtype=np.intp),
+        gols_mandante=np.array(colunas['gols_mandante'], dtype=np.int16),
+        gols_visitante=np.array(colunas['gols_visitante'], dtype=np.int16),
+        rodada=np.array(colunas['rodada'], dtype=np.int16),
+        data=np.array([d or 'NaT' for d in colunas['data_texto']], dtype='datetime64[D]'),
+        data_texto=colunas['data_texto'],
+        jogado=np.array(colunas['jogado'], dtype=bool)
+    )
+
+def obter_temporada(dados, serie):
+    """Aceita uma Temporada pronta ou o cache de jogos bruto"""
+    if isinstance(dados, Temporada):
+        return dados
+    return carregar_temporada(serie, dados)
+
+def ordem_primeira_aparicao(indices):
+    """Índices únicos na ordem em que aparecem pela primeira vez"""
+    unicos, primeira = np.unique(indices, return_index=True)
+    return unicos[np.argsort(primeira)]
+
 # =============================================================================
 # SIMULAÇÃO ESTATÍSTICA
 # =============================================================================
@@ -338,82 +1148,87 @@ def calcular_estatisticas_retrospectivas(cache_jogos, serie):
     """Calcula estatísticas retrospectivas de cada time"""
     log_message(f"Calculando estatísticas da {serie.upper()}...")
     
-    league = "Brazilian Serie A" if serie == "serie_a" else "Brazilian Serie B"
+    temporada = obter_temporada(cache_jogos, serie)
+    jogado = temporada.jogado
+    num_times = len(temporada.times)
+    mandante = temporada.mandante[jogado]
+    visitante = temporada.visitante[jogado]
+    gols_mandante = temporada.gols_mandante[jogado].astype(np.int64)
+    gols_visitante = temporada.gols_visitante[jogado].astype(np.int64)
+    
+    # Cada jogo gera duas linhas (mandante, visitante), na ordem do cache
+    time_linha = np.column_stack([mandante, visitante]).ravel()
+    marcados = np.column_stack([gols_mandante, gols_visitante]).ravel()
+    sofridos = np.column_stack([gols_visitante, gols_mandante]).ravel()
+    
+    def somar_por_time(pesos=None):
+        return np.bincount(time_linha, weights=pesos, minlength=num_times)
+    
+    jogos = somar_por_time()
+    gols_marcados = somar_por_time(marcados)
+    gols_sofridos = somar_por_time(sofridos)
+    soma_quadrados_marcados = somar_por_time(marcados ** 2)
+    soma_quadrados_sofridos = somar_por_time(sofridos ** 2)
+    vitorias = somar_por_time(marcados > sofridos)
+    empates = somar_por_time(marcados == sofridos)
+    derrotas = somar_por_time(marcados < sofridos)
+    
+    # Gols por jogo de cada time, agrupados mantendo a ordem dos jogos
+    ordem = np.argsort(time_linha, kind='stable')
+    limites = np.cumsum(jogos.astype(np.int64))[:-1]
+    marcados_por_time = np.split(marcados[ordem], limites)
+    sofridos_por_time = np.split(sofridos[ordem], limites)
+    
     stats_por_time = defaultdict(lambda: {
         'jogos': 0, 'gols_marcados': 0, 'gols_sofridos': 0, 'vitorias': 0, 
         'empates': 0, 'derrotas': 0, 'gols_por_jogo_marcados': [], 
         'gols_por_jogo_sofridos': [], 'pontos': 0
     })
     
-    for chave_jogo, lista_jogos in cache_jogos.items():
-        for jogo in lista_jogos:
-            if (jogo.get('strLeague') == league and 
-                jogo.get('intHomeScore') is not None and 
-                jogo.get('intAwayScore') is not None):
-                
-                mandante = jogo.get('strHomeTeam')
-                visitante = jogo.get('strAwayTeam')
-                gols_mandante = int(jogo.get('intHomeScore'))
-                gols_visitante = int(jogo.get('intAwayScore'))
-                
-                # Estatísticas do mandante
-                stats_por_time[mandante]['jogos'] += 1
-                stats_por_time[mandante]['gols_marcados'] += gols_mandante
-                stats_por_time[mandante]['gols_sofridos'] += gols_visitante
-                stats_por_time[mandante]['gols_por_jogo_marcados'].append(gols_mandante)
-                stats_por_time[mandante]['gols_por_jogo_sofridos'].append(gols_visitante)
-                
-                # Estatísticas do visitante
-                stats_por_time[visitante]['jogos'] += 1
-                stats_por_time[visitante]['gols_marcados'] += gols_visitante
-                stats_por_time[visitante]['gols_sofridos'] += gols_mandante
-                stats_por_time[visitante]['gols_por_jogo_marcados'].append(gols_visitante)
-                stats_por_time[visitante]['gols_por_jogo_sofridos'].append(gols_mandante)
-                
-                # Resultados
-                if gols_mandante > gols_visitante:
-                    stats_por_time[mandante]['vitorias'] += 1
-                    stats_por_time[mandante]['pontos'] += 3
-                    stats_por_time[visitante]['derrotas'] += 1
-                elif gols_visitante > gols_mandante:
-                    stats_por_time[visitante]['vitorias'] += 1
-                    stats_por_time[visitante]['pontos'] += 3
-                    stats_por_time[mandante]['derrotas'] += 1
-                else:
-                    stats_por_time[mandante]['empates'] += 1
-                    stats_por_time[mandante]['pontos'] += 1
-                    stats_por_time[visitante]['empates'] += 1
-                    stats_por_time[visitante]['pontos'] += 1
-    
-    # Calcular médias e desvios
-    for time, stats in stats_por_time.items():
-        if stats['jogos'] > 0:
-            stats['media_gols_marcados'] = statistics.mean(stats['gols_por_jogo_marcados'])
-            stats['media_gols_sofridos'] = statistics.mean(stats['gols_por_jogo_sofridos'])
-            stats['desvio_gols_marcados'] = statistics.stdev(stats['gols_por_jogo_marcados']) if len(stats['gols_por_jogo_marcados']) > 1 else 0
-            stats['desvio_gols_sofridos'] = statistics.stdev(stats['gols_por_jogo_sofridos']) if len(stats['gols_por_jogo_sofridos']) > 1 else 0
+    # Times na ordem em que aparecem pela primeira vez em jogos disputados
+    for t in ordem_primeira_aparicao(time_linha):
+        n = int(jogos[t])
+        media_marcados = gols_marcados[t] / n
+        media_sofridos = gols_sofridos[t] / n
+        stats_por_time[temporada.times[t]] = {
+            'jogos': n,
+            'gols_marcados': int(gols_marcados[t]),
+            'gols_sofridos': int(gols_sofridos[t]),
+            'vitorias': int(vitorias[t]),
+            'empates': int(empates[t]),
+            'derrotas': int(derrotas[t]),
+            'gols_por_jogo_marcados': marcados_por_time[t].tolist(),
+            'gols_por_jogo_sofridos': sofridos_por_time[t].tolist(),
+            'pontos': int(3 * vitorias[t] + empates[t]),
+            'media_gols_marcados': float(media_marcados),
+            'media_gols_sofridos': float(media_sofridos),
+            'desvio_gols_marcados': desvio_amostral(soma_quadrados_marcados[t], media_marcados, n),
+            'desvio_gols_sofridos': desvio_amostral(soma_quadrados_sofridos[t], media_sofridos, n)
+        }
     
     return stats_por_time
 
+def desvio_amostral(soma_quadrados, media, n):
+    """Desvio padrão amostral a partir da soma dos quadrados (0 com menos de 2 jogos)"""
+    if n < 2:
+        return 0
+    return math.sqrt(max(0.0, (soma_quadrados - n * media * media) / (n - 1)))
+
 def analisar_jogos_futuros(cache_jogos, serie):
     """Analisa jogos futuros do cache"""
     log_message(f"Analisando jogos futuros da {serie.upper()}...")
     
-    league = "Brazilian Serie A" if serie == "serie_a" else "Brazilian Serie B"
+    temporada = obter_temporada(cache_jogos, serie)
     jogos_futuros = []
     
-    for chave_jogo, lista_jogos in cache_jogos.items():
-        for jogo in lista_jogos:
-            if (jogo.get('intHomeScore') is None and 
-                jogo.get('intAwayScore') is None and 
-                jogo.get('strLeague') == league):
-                
-                jogos_futuros.append({
-                    'data': jogo.get('dateEvent'),
-                    'mandante': jogo.get('strHomeTeam'),
-                    'visitante': jogo.get('strAwayTeam'),
-                    'rodada': jogo.get('intRound', '0')
-                })
+    for i in np.flatnonzero(~temporada.jogado):
+        rodada = temporada.rodada[i]
+        jogos_futuros.append({
+            'data': temporada.data_texto[i],
+            'mandante': temporada.times[temporada.mandante[i]],
+            'visitante': temporada.times[temporada.visitante[i]],
+            'rodada': str(rodada) if rodada >= 0 else '0'
+        })
     
     log_message(f"Encontrados {len(jogos_futuros)} jogos futuros")
     return jogos_futuros
@@ -436,7 +1251,7 @@ def simular_resultado_jogo(time_a, time_b, stats_por_time):
     
     return gols_a, gols_b
 
-def simular_campeonato(jogos_futuros, stats_por_time, num_simulacoes=300000):
+def simular_campeonato(jogos_futuros, stats_por_time, num_simulacoes=NUM_SIMULACOES):
     """Executa simulação do campeonato"""
     log_message(f"Executando {num_simulacoes:,} simulações...")
     
@@ -479,13 +1294,13 @@ def simular_campeonato(jogos_futuros, stats_por_time, num_simulacoes=300000):
             resultados['pontos_finais'][time].append(pontos)
             
             # Libertadores (6 primeiros) ou Acesso à Série A (4 primeiros)
-            if pos <= 6:
+            if pos <= ZONA_LIBERTADORES:
                 resultados['libertadores'][time] += 1
-            if pos <= 4:
+            if pos <= ZONA_ACESSO:
                 resultados['acesso_serie_a'][time] += 1
             
             # Rebaixamento (4 últimos)
-            if pos >= 17:
+            if pos >= ZONA_REBAIXAMENTO:
                 resultados['rebaixamento'][time] += 1
     
     # Converter contadores para probabilidades
@@ -496,108 +1311,720 @@ def simular_campeonato(jogos_futuros, stats_por_time, num_simulacoes=300000):
     
     return resultados
 
-def executar_simulacao(serie):
-    """Executa simulação completa para uma série"""
-    log_message(f"Iniciando simulação da {serie.upper()}...")
+def preparar_modelo_vetorizado(jogos_futuros, stats_por_time):
+    """Converte times e jogos futuros em arrays indexados por inteiros"""
+    times = list(stats_por_time.keys())
+    for jogo in jogos_futuros:
+        for time in (jogo['mandante'], jogo['visitante']):
+            if time not in times:
+                times.append(time)
+    indice = {time: i for i, time in enumerate(times)}
+    
+    # Parâmetros por time (mesmos usados em simular_resultado_jogo)
+    stats = [stats_por_time.get(time, {}) for time in times]
+    lambdas = np.array([max(0.1, s.get('media_gols_marcados', 0)) for s in stats])
+    desvio_marcados = np.array([s.get('desvio_gols_marcados', 0) * 0.5 for s in stats])
+    desvio_sofridos = np.array([s.get('desvio_gols_sofridos', 0) * 0.5 for s in stats])
+    pontos_iniciais = np.array([s.get('pontos', 0) for s in stats], dtype=np.int32)
+    
+    mandantes = np.array([indice[jogo['mandante']] for jogo in jogos_futuros], dtype=np.intp)
+    visitantes = np.array([indice[jogo['visitante']] for jogo in jogos_futuros], dtype=np.intp)
+    
+    # Matrizes jogo x time para somar pontos com produto matricial
+    matriz_mandante = np.zeros((len(jogos_futuros), len(times)), dtype=np.int32)
+    matriz_visitante = np.zeros((len(jogos_futuros), len(times)), dtype=np.int32)
+    matriz_mandante[np.arange(len(jogos_futuros)), mandantes] = 1
+    matriz_visitante[np.arange(len(jogos_futuros)), visitantes] = 1
+    
+    return {
+        'times': times,
+        'pontos_iniciais': pontos_iniciais,
+        'lambda_mandante': lambdas[mandantes],
+        'lambda_visitante': lambdas[visitantes],
+        'desvio_mandante': desvio_marcados[mandantes],
+        'desvio_visitante': desvio_sofridos[visitantes],
+        'matriz_mandante': matriz_mandante,
+        'matriz_visitante': matriz_visitante
+    }
+
+def simular_blocos(modelo, num_simulacoes, rng, tamanho_bloco=TAMANHO_BLOCO):
+    """Gera (pontos, posicoes, resultados dos jogos) de blocos de simulações"""
+    num_jogos = len(modelo['lambda_mandante'])
+    num_times = len(modelo['times'])
+    posicoes_base = np.arange(1, num_times + 1, dtype=np.int32)
+    
+    restantes = num_simulacoes
+    while restantes > 0:
+        bloco = min(tamanho_bloco, restantes)
+        restantes -= bloco
+        formato = (bloco, num_jogos)
+        
+        # Poisson + ruído gaussiano, truncado como int() e limitado em zero
+        gols_mandante = np.trunc(rng.poisson(modelo['lambda_mandante'], formato)
+                                 + rng.normal(0.0, modelo['desvio_mandante'], formato))
+        gols_visitante = np.trunc(rng.poisson(modelo['lambda_visitante'], formato)
+                                  + rng.normal(0.0, modelo['desvio_visitante'], formato))
+        np.maximum(gols_mandante, 0, out=gols_mandante)
+        np.maximum(gols_visitante, 0, out=gols_visitante)
+        
+        empate = (gols_mandante == gols_visitante).astype(np.int32)
+        pontos_mandante = 3 * (gols_mandante > gols_visitante).astype(np.int32) + empate
+        pontos_visitante = 3 * (gols_visitante > gols_mandante).astype(np.int32) + empate
+        
+        pontos = (modelo['pontos_iniciais']
+                  + pontos_mandante @ modelo['matriz_mandante']
+                  + pontos_visitante @ modelo['matriz_visitante'])
+        
+        # Ordenação estável: empates mantêm a ordem dos times, como no sorted original
+        ordem = np.argsort(-pontos, axis=1, kind='stable')
+        posicoes = np.empty_like(ordem, dtype=np.int32)
+        np.put_along_axis(posicoes, ordem, np.broadcast_to(posicoes_base, ordem.shape), axis=1)
+        
+        # Resultado de cada jogo: 1 mandante vence, 0 empate, -1 visitante vence
+        resultado_jogos = np.sign(gols_mandante - gols_visitante).astype(np.int8)
+        
+        yield pontos, posicoes, resultado_jogos
+
+def simular_campeonato_vetorizado(jogos_futuros, stats_por_time, num_simulacoes=NUM_SIMULACOES, rng=None):
+    """Executa simulação do campeonato em blocos com NumPy"""
+    log_message(f"Executando {num_simulacoes:,} simulações (motor vetorizado)...")
+    
+    rng = rng if rng is not None else np.random.default_rng()
+    modelo = preparar_modelo_vetorizado(jogos_futuros, stats_por_time)
+    times = modelo['times']
+    
+    blocos_pontos = []
+    blocos_posicoes = []
+    for pontos, posicoes, _ in simular_blocos(modelo, num_simulacoes, rng):
+        blocos_pontos.append(pontos)
+        blocos_posicoes.append(posicoes)
+    pontos = np.concatenate(blocos_pontos) if blocos_pontos else np.zeros((0, len(times)), dtype=np.int32)
+    posicoes = np.concatenate(blocos_posicoes) if blocos_posicoes else np.zeros((0, len(times)), dtype=np.int32)
     
-    # Carregar dados
-    cache_jogos = carregar_cache(serie)
+    resultados = {
+        'posicoes_finais': defaultdict(list),
+        'pontos_finais': defaultdict(list),
+        'libertadores': defaultdict(int),
+        'rebaixamento': defaultdict(int),
+        'acesso_serie_a': defaultdict(int)  # Para Série B
+    }
     
-    # Analisar jogos futuros
-    jogos_futuros = analisar_jogos_futuros(cache_jogos, serie)
+    divisor = max(num_simulacoes, 1)
+    for i, time in enumerate(times):
+        resultados['posicoes_finais'][time] = posicoes[:, i].tolist()
+        resultados['pontos_finais'][time] = pontos[:, i].tolist()
+        resultados['libertadores'][time] = int((posicoes[:, i] <= ZONA_LIBERTADORES).sum()) / divisor * 100
+        resultados['rebaixamento'][time] = int((posicoes[:, i] >= ZONA_REBAIXAMENTO).sum()) / divisor * 100
+        resultados['acesso_serie_a'][time] = int((posicoes[:, i] <= ZONA_ACESSO).sum()) / divisor * 100
     
-    # Calcular estatísticas retrospectivas
-    stats_por_time = calcular_estatisticas_retrospectivas(cache_jogos, serie)
+    return resultados
+
+def resumir_contagens(times, contagem_posicoes, num_simulacoes):
+    """Converte a matriz time x posição em probabilidades por zona da tabela"""
+    divisor = max(num_simulacoes, 1)
+    resumo = {
+        'titulo': {},
+        'libertadores': {},
+        'rebaixamento': {},
+        'acesso_serie_a': {}
+    }
+    for i, time in enumerate(times):
+        contagens = contagem_posicoes[i]
+        resumo['titulo'][time] = int(contagens[0]) / divisor * 100
+        resumo['libertadores'][time] = int(contagens[:ZONA_LIBERTADORES].sum()) / divisor * 100
+        resumo['rebaixamento'][time] = int(contagens[ZONA_REBAIXAMENTO - 1:].sum()) / divisor * 100
+        resumo['acesso_serie_a'][time] = int(contagens[:ZONA_ACESSO].sum()) / divisor * 100
+    return resumo
+
+def calcular_margens_erro(times, contagem_posicoes, num_simulacoes):
+    """Meia largura do intervalo de Wilson (95%) de cada probabilidade publicada, em p.p."""
+    n = max(num_simulacoes, 1)
+    z2 = Z_CONFIANCA ** 2
+    sucessos = {
+        'titulo': contagem_posicoes[:, 0],
+        'libertadores': contagem_posicoes[:, :ZONA_LIBERTADORES].sum(axis=1),
+        'rebaixamento': contagem_posicoes[:, ZONA_REBAIXAMENTO - 1:].sum(axis=1),
+        'acesso_serie_a': contagem_posicoes[:, :ZONA_ACESSO].sum(axis=1)
+    }
+    margens = {}
+    for zona, contagem in sucessos.items():
+        p = contagem / n
+        meia_largura = Z_CONFIANCA / (1 + z2 / n) * np.sqrt(p * (1 - p) / n + z2 / (4 * n * n)) * 100
+        margens[zona] = {time: float(m) for time, m in zip(times, meia_largura)}
+    return margens
+
+def acumular_contagens(modelo, num_simulacoes, rng, tamanho_bloco=TAMANHO_BLOCO, guardar_cenarios=False):
+    """Processa simulações em blocos mantendo só contagens de posições e histograma de pontos
+    
+    Com guardar_cenarios=True também devolve as matrizes int8 simulações x jogos
+    (resultado de cada jogo) e simulações x times (posição final).
+    """
+    num_times = len(modelo['times'])
+    jogos_restantes = modelo['matriz_mandante'].sum(axis=0) + modelo['matriz_visitante'].sum(axis=0)
+    pontos_maximos = int((modelo['pontos_iniciais'] + 3 * jogos_restantes).max()) if num_times else 0
+    largura = pontos_maximos + 1
+    
+    contagem_posicoes = np.zeros((num_times, num_times), dtype=np.int64)
+    histograma_pontos = np.zeros((num_times, largura), dtype=np.int64)
+    deslocamento_posicoes = np.arange(num_times) * num_times
+    deslocamento_pontos = np.arange(num_times) * largura
+    blocos_resultados = []
+    blocos_posicoes = []
+    
+    for pontos, posicoes, resultado_jogos in simular_blocos(modelo, num_simulacoes, rng, tamanho_bloco):
+        # bincount sobre índices achatados (time, posição) e (time, pontos)
+        contagem_posicoes += np.bincount(
+            (deslocamento_posicoes + posicoes - 1).ravel(), minlength=num_times * num_times
+        ).reshape(num_times, num_times)
+        histograma_pontos += np.bincount(
+            (deslocamento_pontos + pontos).ravel(), minlength=num_times * largura
+        ).reshape(num_times, largura)
+        
+        if guardar_cenarios:
+            blocos_resultados.append(resultado_jogos)
+            blocos_posicoes.append(posicoes.astype(np.int8))
+    
+    cenarios = None
+    if guardar_cenarios:
+        num_jogos = len(modelo['lambda_mandante'])
+        cenarios = (
+            np.concatenate(blocos_resultados) if blocos_resultados else np.zeros((0, num_jogos), dtype=np.int8),
+            np.concatenate(blocos_posicoes) if blocos_posicoes else np.zeros((0, num_times), dtype=np.int8)
+        )
+    
+    return contagem_posicoes, histograma_pontos, cenarios
+
+def dividir_simulacoes(num_simulacoes, num_partes):
+    """Divide o total de simulações em partes quase iguais (as primeiras recebem o resto)"""
+    base, resto = divmod(num_simulacoes, num_partes)
+    return [base + (1 if i < resto else 0) for i in range(num_partes)]
+
+def contexto_processos():
+    """Contexto dos pools de processos: forkserver onde existe, senão spawn
+    
+    Os pools são criados com threads vivas (pipeline concorrente, sessão HTTP,
+    logs); um fork herdaria locks presos e o worker poderia travar.
+    """
+    metodo = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(metodo)
+
+def simular_fatia(modelo, num_simulacoes, semente, guardar_cenarios=False):
+    """Executa uma fatia do modo acumulador com fluxo aleatório próprio (usado pelos workers)"""
+    rng = np.random.default_rng(semente)
+    return acumular_contagens(modelo, num_simulacoes, rng, guardar_cenarios=guardar_cenarios)
+
+def simular_campeonato_acumulado(jogos_futuros, stats_por_time, num_simulacoes=NUM_SIMULACOES,
+                                 seed=None, workers=WORKERS_SIMULACAO, guardar_cenarios=False):
+    """Executa simulação em blocos com memória constante (contagens em vez de listas)"""
+    workers = workers or os.cpu_count() or 1
+    log_message(f"Executando {num_simulacoes:,} simulações (modo acumulador, {workers} worker(s))...")
     
-    # Executar simulação
-    resultados = simular_campeonato(jogos_futuros, stats_por_time)
+    modelo = preparar_modelo_vetorizado(jogos_futuros, stats_por_time)
     
-    # Salvar resultados
-    with open(f'data/resultados_simulacao_{serie}.json', 'w', encoding='utf-8') as f:
-        # Converter numpy arrays para listas
-        resultados_serializaveis = {}
-        for key, value in resultados.items():
-            if isinstance(value, dict):
-                resultados_serializaveis[key] = {}
-                for subkey, subvalue in value.items():
-                    if isinstance(subvalue, list):
-                        resultados_serializaveis[key][subkey] = subvalue
-                    else:
-                        resultados_serializaveis[key][subkey] = subvalue
+    # Um fluxo independente por worker, todos derivados da mesma semente raiz
+    sementes = np.random.SeedSequence(seed).spawn(workers)
+    fatias = dividir_simulacoes(num_simulacoes, workers)
+    
+    if workers == 1:
+        parciais = [simular_fatia(modelo, fatias[0], sementes[0], guardar_cenarios)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=contexto_processos()) as executor:
+            parciais = list(executor.map(simular_fatia, [modelo] * workers, fatias, sementes,
+                                         [guardar_cenarios] * workers))
+    
+    # Somar histogramas parciais na ordem dos workers
+    contagem_posicoes = sum(parcial[0] for parcial in parciais)
+    histograma_pontos = sum(parcial[1] for parcial in parciais)
+    
+    resultados = {
+        'times': modelo['times'],
+        'num_simulacoes': num_simulacoes,
+        'seed': seed,
+        'workers': workers,
+        'contagem_posicoes': contagem_posicoes,
+        'histograma_pontos': histograma_pontos
+    }
+    resultados.update(resumir_contagens(modelo['times'], contagem_posicoes, num_simulacoes))
+    
+    if guardar_cenarios:
+        # Linhas concatenadas na ordem dos workers, como os histogramas
+        resultados['cenarios'] = {
+            'jogos': [{k: jogo.get(k) for k in ('mandante', 'visitante', 'data', 'rodada')}
+                      for jogo in jogos_futuros],
+            'resultados_jogos': np.concatenate([parcial[2][0] for parcial in parciais]),
+            'posicoes': np.concatenate([parcial[2][1] for parcial in parciais])
+        }
+    return resultados
+
+def distribuicao_gols(lambda_gols, desvio, max_gols=20):
+    """Distribuição exata de max(0, int(Poisson(lambda) + Normal(0, desvio)))"""
+    limite_poisson = int(math.ceil(lambda_gols + 10 * math.sqrt(lambda_gols) + 10))
+    poisson = np.array([math.exp(k * math.log(lambda_gols) - lambda_gols - math.lgamma(k + 1))
+                        for k in range(limite_poisson + 1)])
+    
+    probabilidades = np.zeros(max_gols + 1)
+    if desvio <= 0:
+        alcance = min(limite_poisson, max_gols)
+        probabilidades[:alcance + 1] = poisson[:alcance + 1]
+    else:
+        # int() trunca em direção a zero: G = 0 se x < 1, G = g se g <= x < g + 1
+        normal_cdf = lambda z: 0.5 * (1 + math.erf(z / math.sqrt(2)))
+        for k, p_k in enumerate(poisson):
+            acumulada_anterior = 0.0
+            for g in range(max_gols + 1):
+                acumulada = normal_cdf((g + 1 - k) / desvio)
+                probabilidades[g] += p_k * (acumulada - acumulada_anterior)
+                acumulada_anterior = acumulada
+    return probabilidades / probabilidades.sum()
+
+def probabilidades_jogo(modelo, indice_jogo):
+    """Probabilidades (vitória mandante, empate, vitória visitante) de um jogo futuro"""
+    gols_mandante = distribuicao_gols(modelo['lambda_mandante'][indice_jogo], modelo['desvio_mandante'][indice_jogo])
+    gols_visitante = distribuicao_gols(modelo['lambda_visitante'][indice_jogo], modelo['desvio_visitante'][indice_jogo])
+    placares = np.outer(gols_mandante, gols_visitante)
+    vitoria_mandante = float(np.tril(placares, -1).sum())
+    empate = float(np.trace(placares))
+    return vitoria_mandante, empate, max(0.0, 1.0 - vitoria_mandante - empate)
+
+def simular_campeonato_analitico(jogos_futuros, stats_por_time, num_simulacoes=None):
+    """Distribuição exata de pontos por time via convolução das probabilidades V/E/D de cada jogo
+    
+    Usa os mesmos parâmetros de simular_resultado_jogo. Dá pontos esperados e
+    distribuição de pontos (marginais), mas não posições finais.
+    """
+    log_message("Calculando distribuição analítica de pontos...")
+    
+    modelo = preparar_modelo_vetorizado(jogos_futuros, stats_por_time)
+    times = modelo['times']
+    distribuicoes = [np.zeros(int(pontos) + 1) for pontos in modelo['pontos_iniciais']]
+    for distribuicao in distribuicoes:
+        distribuicao[-1] = 1.0
+    
+    probabilidades = []
+    mandantes = modelo['matriz_mandante'].argmax(axis=1)
+    visitantes = modelo['matriz_visitante'].argmax(axis=1)
+    for j, jogo in enumerate(jogos_futuros):
+        vitoria, empate, derrota = probabilidades_jogo(modelo, j)
+        probabilidades.append({
+            'mandante': jogo['mandante'],
+            'visitante': jogo['visitante'],
+            'vitoria_mandante': vitoria,
+            'empate': empate,
+            'vitoria_visitante': derrota
+        })
+        # Pontos ganhos no jogo: 0, 1 ou 3
+        distribuicoes[mandantes[j]] = np.convolve(distribuicoes[mandantes[j]], [derrota, empate, 0.0, vitoria])
+        distribuicoes[visitantes[j]] = np.convolve(distribuicoes[visitantes[j]], [vitoria, empate, 0.0, derrota])
+    
+    return {
+        'times': times,
+        'pontos_esperados': {time: float(np.dot(np.arange(len(d)), d)) for time, d in zip(times, distribuicoes)},
+        'distribuicao_pontos': {time: d.tolist() for time, d in zip(times, distribuicoes)},
+        'probabilidades_jogos': probabilidades
+    }
+
+def comparar_analitico_monte_carlo(analitico, simulacao):
+    """Distância entre as marginais analíticas e o histograma de pontos do Monte Carlo"""
+    comparacao = {}
+    for time, histograma in zip(simulacao['times'], simulacao['histograma_pontos']):
+        if time not in analitico['distribuicao_pontos']:
+            continue
+        total = histograma.sum()
+        if total == 0:
+            continue
+        monte_carlo = histograma / total
+        exata = np.asarray(analitico['distribuicao_pontos'][time])
+        largura = max(len(monte_carlo), len(exata))
+        monte_carlo = np.pad(monte_carlo, (0, largura - len(monte_carlo)))
+        exata = np.pad(exata, (0, largura - len(exata)))
+        comparacao[time] = {
+            'diferenca_pontos_esperados': float(np.dot(np.arange(largura), exata - monte_carlo)),
+            'variacao_total': float(0.5 * np.abs(exata - monte_carlo).sum())
+        }
+    
+    return {
+        'num_simulacoes': simulacao['num_simulacoes'],
+        'max_diferenca_pontos_esperados': max((abs(c['diferenca_pontos_esperados']) for c in comparacao.values()), default=0.0),
+        'max_variacao_total': max((c['variacao_total'] for c in comparacao.values()), default=0.0),
+        'por_time': comparacao
+    }
+
+def simular_campeonato_adaptativo(jogos_futuros, stats_por_time, tolerancia, max_simulacoes=NUM_SIMULACOES,
+                                  seed=None, workers=WORKERS_SIMULACAO, lote=LOTE_ADAPTATIVO, zonas=ZONAS_WEB):
+    """Simula em lotes até as margens de erro das `zonas` ficarem abaixo da tolerância (ou atingir o teto)"""
+    if max_simulacoes < 1:
+        raise ValueError(f"Teto de simulações inválido: {max_simulacoes} (mínimo 1)")
+    workers = workers or os.cpu_count() or 1
+    log_message(f"Executando simulações adaptativas (tolerância {tolerancia} p.p., teto {max_simulacoes:,})...")
+    
+    modelo = preparar_modelo_vetorizado(jogos_futuros, stats_por_time)
+    times = modelo['times']
+    raiz = np.random.SeedSequence(seed)
+    
+    contagem_posicoes = 0
+    histograma_pontos = 0
+    num_simulacoes = 0
+    margem_maxima = float('inf')
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=contexto_processos()) if workers > 1 else None
+    try:
+        while num_simulacoes < max_simulacoes:
+            tamanho = min(lote, max_simulacoes - num_simulacoes)
+            # Cada lote recebe novos fluxos derivados da raiz: reprodutível para a mesma seed/workers
+            sementes = raiz.spawn(workers)
+            fatias = dividir_simulacoes(tamanho, workers)
+            if executor is None:
+                parciais = [simular_fatia(modelo, fatias[0], sementes[0])]
             else:
-                resultados_serializaveis[key] = value
+                parciais = list(executor.map(simular_fatia, [modelo] * workers, fatias, sementes))
+            
+            for parcial in parciais:
+                contagem_posicoes = contagem_posicoes + parcial[0]
+                histograma_pontos = histograma_pontos + parcial[1]
+            num_simulacoes += tamanho
+            
+            margens = calcular_margens_erro(times, contagem_posicoes, num_simulacoes)
+            margem_maxima = max(max(margens[zona].values(), default=0.0) for zona in zonas)
+            log_message(f"  {num_simulacoes:,} simulações - maior margem de erro: {margem_maxima:.3f} p.p.")
+            if margem_maxima <= tolerancia:
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    
+    if margem_maxima > tolerancia:
+        log_message(f"  Teto de {max_simulacoes:,} simulações atingido antes da tolerância")
+    
+    resultados = {
+        'times': times,
+        'num_simulacoes': num_simulacoes,
+        'seed': seed,
+        'workers': workers,
+        'tolerancia': tolerancia,
+        'contagem_posicoes': contagem_posicoes,
+        'histograma_pontos': histograma_pontos,
+        'margens_erro': margens
+    }
+    resultados.update(resumir_contagens(times, contagem_posicoes, num_simulacoes))
+    return resultados
+
+# Motores disponíveis para executar_simulacao
+MOTORES_SIMULACAO = {
+    "python": simular_campeonato,
+    "numpy": simular_campeonato_vetorizado,
+    "acumulador": simular_campeonato_acumulado,
+    "analitico": simular_campeonato_analitico,
+}
+
+def contagens_de_resultados(resultados):
+    """Converte listas por simulação (motores python/numpy) em contagens agregadas"""
+    if 'contagem_posicoes' in resultados:
+        return resultados['times'], resultados['contagem_posicoes'], resultados['histograma_pontos']
+    
+    times = list(resultados['posicoes_finais'].keys())
+    pontos_maximos = max((max(pontos) for pontos in resultados['pontos_finais'].values() if pontos), default=0)
+    contagem_posicoes = np.zeros((len(times), len(times)), dtype=np.int64)
+    histograma_pontos = np.zeros((len(times), pontos_maximos + 1), dtype=np.int64)
+    for i, time in enumerate(times):
+        posicoes = np.asarray(resultados['posicoes_finais'][time], dtype=np.int64)
+        pontos = np.asarray(resultados['pontos_finais'][time], dtype=np.int64)
+        contagem_posicoes[i] = np.bincount(posicoes - 1, minlength=len(times))
+        histograma_pontos[i] = np.bincount(pontos, minlength=pontos_maximos + 1)
+    return times, contagem_posicoes, histograma_pontos
+
+def salvar_resultados_simulacao(resultados, serie, motor=MOTOR_SIMULACAO):
+    """Salva contagens da simulação em .npz com um cabeçalho JSON pequeno"""
+    times, contagem_posicoes, histograma_pontos = contagens_de_resultados(resultados)
+    cabecalho = {
+        'versao': 1,
+        'serie': serie,
+        'times': times,
+        'num_simulacoes': int(contagem_posicoes[0].sum()) if len(times) else 0,
+        'motor': motor,
+        'seed': resultados.get('seed'),
+        'workers': resultados.get('workers'),
+        'tolerancia': resultados.get('tolerancia'),
+        'gerado_em': datetime.now().isoformat()
+    }
+    contar("simulacoes", cabecalho['num_simulacoes'])
+    np.savez(
+        f'data/resultados_simulacao_{serie}.npz',
+        cabecalho=np.array(json.dumps(cabecalho, ensure_ascii=False)),
+        contagem_posicoes=contagem_posicoes,
+        histograma_pontos=histograma_pontos
+    )
+    contar_arquivo(f'data/resultados_simulacao_{serie}.npz', "bytes_gravados")
+
+def carregar_resultados_simulacao(serie):
+    """Carrega contagens da simulação salvas por salvar_resultados_simulacao"""
+    with np.load(f'data/resultados_simulacao_{serie}.npz', allow_pickle=False) as arquivo:
+        resultados = json.loads(str(arquivo['cabecalho']))
+        resultados['contagem_posicoes'] = arquivo['contagem_posicoes']
+        resultados['histograma_pontos'] = arquivo['histograma_pontos']
+    contar_arquivo(f'data/resultados_simulacao_{serie}.npz', "bytes_lidos")
+    return resultados
+
+def executar_estatisticas(serie, temporada=None):
+    """Calcula estatísticas e jogos futuros e salva em data/estatisticas_{serie}.json"""
+    temporada = temporada if temporada is not None else carregar_temporada(serie)
+    estatisticas = {
+        'jogos_futuros': analisar_jogos_futuros(temporada, serie),
+        'stats_por_time': calcular_estatisticas_retrospectivas(temporada, serie)
+    }
+    with open(f'data/estatisticas_{serie}.json', 'w', encoding='utf-8') as f:
+        json.dump(estatisticas, f, ensure_ascii=False, indent=2)
+    contar_arquivo(f'data/estatisticas_{serie}.json', "bytes_gravados")
+    return estatisticas
+
+def carregar_estatisticas(serie):
+    """Carrega o artefato salvo por executar_estatisticas"""
+    with open(f'data/estatisticas_{serie}.json', 'r', encoding='utf-8') as f:
+        estatisticas = json.load(f)
+    contar_arquivo(f'data/estatisticas_{serie}.json', "bytes_lidos")
+    stats_por_time = defaultdict(dict)
+    stats_por_time.update(estatisticas['stats_por_time'])
+    return {'jogos_futuros': estatisticas['jogos_futuros'], 'stats_por_time': stats_por_time}
+
+def executar_simulacao(serie, num_simulacoes=NUM_SIMULACOES, motor=MOTOR_SIMULACAO,
+                       seed=None, workers=WORKERS_SIMULACAO, guardar_cenarios=False,
+                       tolerancia=TOLERANCIA_SIMULACAO, estatisticas=None):
+    """Executa simulação completa para uma série
+    
+    Com tolerancia (p.p.) o motor acumulador roda em modo adaptativo e
+    num_simulacoes passa a ser o teto. `estatisticas` (de executar_estatisticas)
+    evita recalcular as estatísticas a partir do cache.
+    """
+    log_message(f"Iniciando simulação da {serie.upper()}...")
+    
+    if motor not in MOTORES_SIMULACAO:
+        raise ValueError(f"Motor de simulação desconhecido: {motor} (opções: {', '.join(MOTORES_SIMULACAO)})")
+    
+    if estatisticas is not None:
+        jogos_futuros = estatisticas['jogos_futuros']
+        stats_por_time = estatisticas['stats_por_time']
+    else:
+        # Carregar dados
+        temporada = carregar_temporada(serie)
         
-        json.dump(resultados_serializaveis, f, ensure_ascii=False, indent=2)
+        # Analisar jogos futuros
+        jogos_futuros = analisar_jogos_futuros(temporada, serie)
+        
+        # Calcular estatísticas retrospectivas
+        stats_por_time = calcular_estatisticas_retrospectivas(temporada, serie)
+    
+    # Modo analítico: prévia rápida, não substitui os resultados do Monte Carlo
+    if motor == "analitico":
+        resultados = simular_campeonato_analitico(jogos_futuros, stats_por_time)
+        if Path(f'data/resultados_simulacao_{serie}.npz').exists():
+            comparacao = comparar_analitico_monte_carlo(resultados, carregar_resultados_simulacao(serie))
+            resultados['comparacao_monte_carlo'] = comparacao
+            log_message(f"  Analítico vs Monte Carlo: até {comparacao['max_diferenca_pontos_esperados']:.3f} "
+                        f"pontos esperados, variação total máxima {comparacao['max_variacao_total']:.4f}")
+        with open(f'data/previa_analitica_{serie}.json', 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+        log_message(f"Prévia analítica da {serie.upper()} concluída!")
+        return resultados
+    
+    # Executar simulação
+    if motor == "acumulador" and tolerancia is not None:
+        if guardar_cenarios:
+            log_message("Cenários não são guardados no modo adaptativo")
+        resultados = simular_campeonato_adaptativo(jogos_futuros, stats_por_time, tolerancia, num_simulacoes,
+                                                   seed=seed, workers=workers, zonas=ZONAS_SERIE[serie])
+    elif motor == "acumulador":
+        resultados = simular_campeonato_acumulado(jogos_futuros, stats_por_time, num_simulacoes,
+                                                  seed=seed, workers=workers,
+                                                  guardar_cenarios=guardar_cenarios)
+    elif motor == "numpy":
+        resultados = simular_campeonato_vetorizado(jogos_futuros, stats_por_time, num_simulacoes,
+                                                   rng=np.random.default_rng(seed))
+    else:
+        # Motor original usa os geradores globais
+        if seed is not None:
+            random.seed(seed)
+            np.random.seed(seed)
+        resultados = simular_campeonato(jogos_futuros, stats_por_time, num_simulacoes)
+    
+    # Salvar resultados
+    salvar_resultados_simulacao(resultados, serie, motor)
+    
+    if guardar_cenarios:
+        if 'cenarios' in resultados:
+            salvar_cenarios(resultados, serie)
+            alavancagem = calcular_alavancagem(carregar_cenarios(serie))
+            with open(f'data/alavancagem_{serie}.json', 'w', encoding='utf-8') as f:
+                json.dump(alavancagem, f, ensure_ascii=False, indent=2)
+        else:
+            log_message(f"Cenários só são guardados pelo motor 'acumulador' (motor atual: {motor})")
     
     log_message(f"Simulação da {serie.upper()} concluída!")
     return resultados
 
+# =============================================================================
+# CENÁRIOS (E SE?) E ALAVANCAGEM DOS JOGOS
+# =============================================================================
+
+# Códigos de resultado guardados na matriz simulações x jogos
+RESULTADOS_JOGO = {"mandante": 1, "empate": 0, "visitante": -1}
+
+def salvar_cenarios(resultados, serie):
+    """Salva resultados por jogo e posições finais de cada simulação (int8)"""
+    cenarios = resultados['cenarios']
+    cabecalho = {
+        'serie': serie,
+        'times': resultados['times'],
+        'jogos': cenarios['jogos'],
+        'num_simulacoes': resultados['num_simulacoes']
+    }
+    np.savez_compressed(
+        f'data/cenarios_{serie}.npz',
+        cabecalho=np.array(json.dumps(cabecalho, ensure_ascii=False)),
+        resultados_jogos=cenarios['resultados_jogos'],
+        posicoes=cenarios['posicoes']
+    )
+    contar_arquivo(f'data/cenarios_{serie}.npz', "bytes_gravados")
+
+def carregar_cenarios(serie):
+    """Carrega as matrizes de cenários salvas por salvar_cenarios"""
+    with np.load(f'data/cenarios_{serie}.npz', allow_pickle=False) as arquivo:
+        cenarios = json.loads(str(arquivo['cabecalho']))
+        cenarios['resultados_jogos'] = arquivo['resultados_jogos']
+        cenarios['posicoes'] = arquivo['posicoes']
+    contar_arquivo(f'data/cenarios_{serie}.npz', "bytes_lidos")
+    return cenarios
+
+def contagem_posicoes_de(posicoes, num_times):
+    """Monta a matriz time x posição a partir das posições (simulações x times)"""
+    deslocamento = np.arange(num_times) * num_times
+    return np.bincount(
+        (deslocamento + posicoes.astype(np.int64) - 1).ravel(), minlength=num_times * num_times
+    ).reshape(num_times, num_times)
+
+def indice_jogo(cenarios, mandante, visitante):
+    """Retorna a coluna do jogo mandante x visitante na matriz de cenários"""
+    for i, jogo in enumerate(cenarios['jogos']):
+        if jogo['mandante'] == mandante and jogo['visitante'] == visitante:
+            return i
+    raise ValueError(f"Jogo não encontrado entre os jogos futuros: {mandante} vs {visitante}")
+
+def consultar_cenario(cenarios, condicoes):
+    """Probabilidades condicionadas a resultados de jogos
+    
+    condicoes: lista de (mandante, visitante, resultado), com resultado em
+    "mandante", "empate" ou "visitante".
+    """
+    mascara = np.ones(len(cenarios['posicoes']), dtype=bool)
+    for mandante, visitante, resultado in condicoes:
+        if resultado not in RESULTADOS_JOGO:
+            raise ValueError(f"Resultado inválido: {resultado} (opções: {', '.join(RESULTADOS_JOGO)})")
+        coluna = indice_jogo(cenarios, mandante, visitante)
+        mascara &= cenarios['resultados_jogos'][:, coluna] == RESULTADOS_JOGO[resultado]
+    
+    num_simulacoes = int(mascara.sum())
+    if num_simulacoes == 0:
+        raise ValueError("Nenhuma simulação satisfaz as condições informadas")
+    
+    times = cenarios['times']
+    contagem = contagem_posicoes_de(cenarios['posicoes'][mascara], len(times))
+    resposta = resumir_contagens(times, contagem, num_simulacoes)
+    resposta['simulacoes'] = num_simulacoes
+    return resposta
+
+def calcular_alavancagem(cenarios, min_ocorrencias=MIN_OCORRENCIAS_ALAVANCAGEM):
+    """Tabela por jogo: quanto cada resultado mexe nas zonas da série (ZONAS_SERIE)
+    
+    A alavancagem de um jogo para um time é a diferença entre a maior e a menor
+    probabilidade condicionada entre os resultados do jogo que saíram em pelo
+    menos `min_ocorrencias` simulações.
+    """
+    times = cenarios['times']
+    resultados_jogos = cenarios['resultados_jogos']
+    posicoes = cenarios['posicoes']
+    num_simulacoes = len(posicoes)
+    if num_simulacoes == 0:
+        return []
+    
+    # Indicadores times x simulações (bool) só das zonas da série
+    faixas = {
+        'titulo': (1, 1),
+        'libertadores': (1, ZONA_LIBERTADORES),
+        'acesso_serie_a': (1, ZONA_ACESSO),
+        'rebaixamento': (ZONA_REBAIXAMENTO, len(times))
+    }
+    zonas = {
+        zona: np.ascontiguousarray(((posicoes >= faixas[zona][0]) & (posicoes <= faixas[zona][1])).T)
+        for zona in ZONAS_SERIE.get(cenarios.get('serie'), ZONAS_WEB)
+    }
+    codigos = list(RESULTADOS_JOGO.items())
+    
+    # Um jogo por vez, com máscaras booleanas sobre a coluna int8: memória O(simulações),
+    # sem matriz one-hot simulações x jogos
+    tabela = []
+    for j, jogo in enumerate(cenarios['jogos']):
+        mascaras = [resultados_jogos[:, j] == codigo for _, codigo in codigos]
+        ocorrencias = [np.count_nonzero(mascara) for mascara in mascaras]
+        possiveis = [r for r in range(len(codigos)) if ocorrencias[r] >= max(min_ocorrencias, 1)]
+        entrada = dict(jogo)
+        entrada['probabilidade_resultados'] = {
+            nome: round(float(ocorrencias[r]) / num_simulacoes * 100, 1) for r, (nome, _) in enumerate(codigos)
+        }
+        entrada['impacto'] = {}
+        alavancagem = 0.0
+        for zona, indicador in zonas.items():
+            if len(possiveis) < 2:
+                entrada['impacto'][zona] = {}
+                continue
+            probabilidades = np.array([
+                np.count_nonzero(indicador & mascaras[r], axis=1) / ocorrencias[r] * 100 for r in possiveis
+            ])
+            variacao = probabilidades.max(axis=0) - probabilidades.min(axis=0)
+            entrada['impacto'][zona] = {
+                times[t]: round(float(variacao[t]), 1) for t in np.argsort(-variacao) if variacao[t] >= 0.05
+            }
+            alavancagem = max(alavancagem, float(variacao.max()))
+        entrada['alavancagem'] = round(alavancagem, 1)
+        tabela.append(entrada)
+    
+    tabela.sort(key=lambda entrada: entrada['alavancagem'], reverse=True)
+    return tabela
+
 # =============================================================================
 # PROCESSAMENTO PARA WEB
 # =============================================================================
 
 def calcular_classificacao_real(cache_data, serie):
     """Calcula classificação real baseada nos jogos do cache"""
-    league = "Brazilian Serie A" if serie == "serie_a" else "Brazilian Serie B"
-    times_stats = defaultdict(lambda: {
-        'jogos': 0, 'vitorias': 0, 'empates': 0, 'derrotas': 0,
-        'gols_pro': 0, 'gols_contra': 0, 'pontos': 0
-    })
+    temporada = obter_temporada(cache_data, serie)
+    jogado = temporada.jogado
+    num_times = len(temporada.times)
     
-    # Processar todos os jogos do cache
-    for jogos in cache_data.values():
-        if isinstance(jogos, list):
-            for jogo in jogos:
-                if (jogo.get('intHomeScore') is not None and 
-                    jogo.get('intAwayScore') is not None and
-                    jogo.get('strLeague') == league and
-                    jogo.get('strHomeTeam') and 
-                    jogo.get('strAwayTeam')):
-                    
-                    home_team = jogo['strHomeTeam']
-                    away_team = jogo['strAwayTeam']
-                    home_score = int(jogo['intHomeScore'])
-                    away_score = int(jogo['intAwayScore'])
-                    
-                    # Atualizar estatísticas
-                    times_stats[home_team]['jogos'] += 1
-                    times_stats[home_team]['gols_pro'] += home_score
-                    times_stats[home_team]['gols_contra'] += away_score
-                    
-                    times_stats[away_team]['jogos'] += 1
-                    times_stats[away_team]['gols_pro'] += away_score
-                    times_stats[away_team]['gols_contra'] += home_score
-                    
-                    # Resultados
-                    if home_score > away_score:
-                        times_stats[home_team]['vitorias'] += 1
-                        times_stats[home_team]['pontos'] += 3
-                        times_stats[away_team]['derrotas'] += 1
-                    elif away_score > home_score:
-                        times_stats[away_team]['vitorias'] += 1
-                        times_stats[away_team]['pontos'] += 3
-                        times_stats[home_team]['derrotas'] += 1
-                    else:
-                        times_stats[home_team]['empates'] += 1
-                        times_stats[home_team]['pontos'] += 1
-                        times_stats[away_team]['empates'] += 1
-                        times_stats[away_team]['pontos'] += 1
+    time_linha = np.column_stack([temporada.mandante[jogado], temporada.visitante[jogado]]).ravel()
+    gols_pro = np.column_stack([temporada.gols_mandante[jogado], temporada.gols_visitante[jogado]]).ravel()
+    gols_contra = np.column_stack([temporada.gols_visitante[jogado], temporada.gols_mandante[jogado]]).ravel()
+    
+    def somar_por_time(pesos=None):
+        return np.bincount(time_linha, weights=pesos, minlength=num_times).astype(np.int64)
+    
+    jogos = somar_por_time()
+    soma_pro = somar_por_time(gols_pro)
+    soma_contra = somar_por_time(gols_contra)
+    vitorias = somar_por_time(gols_pro > gols_contra)
+    empates = somar_por_time(gols_pro == gols_contra)
+    derrotas = somar_por_time(gols_pro < gols_contra)
     
     # Converter para lista e ordenar
     classificacao = []
-    for time, stats in times_stats.items():
-        if stats['jogos'] > 0:
-            classificacao.append({
-                'time': time,
-                'pontos': stats['pontos'],
-                'jogos': stats['jogos'],
-                'vitorias': stats['vitorias'],
-                'empates': stats['empates'],
-                'derrotas': stats['derrotas'],
-                'gols_pro': stats['gols_pro'],
-                'gols_contra': stats['gols_contra'],
-                'saldo_gols': stats['gols_pro'] - stats['gols_contra']
-            })
+    for t in ordem_primeira_aparicao(time_linha):
+        classificacao.append({
+            'time': temporada.times[t],
+            'pontos': int(3 * vitorias[t] + empates[t]),
+            'jogos': int(jogos[t]),
+            'vitorias': int(vitorias[t]),
+            'empates': int(empates[t]),
+            'derrotas': int(derrotas[t]),
+            'gols_pro': int(soma_pro[t]),
+            'gols_contra': int(soma_contra[t]),
+            'saldo_gols': int(soma_pro[t] - soma_contra[t])
+        })
     
     # Ordenar por pontos
     classificacao.sort(key=lambda x: (x['pontos'], x['vitorias'], x['saldo_gols']), reverse=True)
@@ -606,38 +2033,92 @@ def calcular_classificacao_real(cache_data, serie):
 
 def encontrar_proxima_rodada(cache_data, serie):
     """Encontra a próxima rodada"""
-    league = "Brazilian Serie A" if serie == "serie_a" else "Brazilian Serie B"
-    rodadas_jogadas = set()
-    rodadas_pendentes = set()
-    
-    for jogos in cache_data.values():
-        if isinstance(jogos, list):
-            for jogo in jogos:
-                if jogo.get('intRound') and jogo.get('strLeague') == league:
-                    rodada = int(jogo['intRound'])
-                    
-                    if (jogo.get('intHomeScore') is not None and 
-                        jogo.get('intAwayScore') is not None):
-                        rodadas_jogadas.add(rodada)
-                    else:
-                        rodadas_pendentes.add(rodada)
-    
-    ultima_rodada_jogada = max(rodadas_jogadas) if rodadas_jogadas else 0
-    proximas_rodadas = [r for r in rodadas_pendentes if r > ultima_rodada_jogada]
-    proxima_rodada = min(proximas_rodadas) if proximas_rodadas else ultima_rodada_jogada + 1
+    temporada = obter_temporada(cache_data, serie)
+    com_rodada = temporada.rodada >= 0
+    rodadas_jogadas = temporada.rodada[com_rodada & temporada.jogado]
+    rodadas_pendentes = temporada.rodada[com_rodada & ~temporada.jogado]
+    
+    ultima_rodada_jogada = int(rodadas_jogadas.max()) if len(rodadas_jogadas) else 0
+    proximas_rodadas = rodadas_pendentes[rodadas_pendentes > ultima_rodada_jogada]
+    proxima_rodada = int(proximas_rodadas.min()) if len(proximas_rodadas) else ultima_rodada_jogada + 1
     
     return proxima_rodada
 
+def gravar_artefato_web(dados, caminho):
+    """Grava JSON minificado e as variantes .gz (e .br, se houver brotli) para servir sem comprimir por requisição"""
+    conteudo = json.dumps(dados, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    variantes = {caminho: conteudo, f"{caminho}.gz": gzip.compress(conteudo, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variantes[f"{caminho}.br"] = brotli.compress(conteudo, quality=11)
+    elif Path(f"{caminho}.br").exists():
+        Path(f"{caminho}.br").unlink()  # Variante antiga ficaria desatualizada
+    
+    for destino, dados_bytes in variantes.items():
+        temporario = f"{destino}.tmp"
+        with open(temporario, 'wb') as f:
+            f.write(dados_bytes)
+        os.replace(temporario, destino)
+        contar("bytes_gravados", len(dados_bytes))
+    return variantes
+
+def construir_indices_web(dados_web, serie):
+    """Fatias prontas de dados_web para a API: por time, por zona e por rodada"""
+    league = LIGAS[serie]['strLeague']
+    eventos = sorted(
+        (evento for evento in iterar_eventos(carregar_cache(serie)) if evento.get('strLeague') == league),
+        key=lambda evento: (evento.get('dateEvent') or '', evento.get('strTime') or '')
+    )
+    
+    probabilidades = {}
+    for zona in ZONAS_WEB:
+        margens = dados_web['margens_erro'].get(zona, {})
+        probabilidades[zona] = sorted(
+            ({'time': time, 'probabilidade': round(p, 2), 'margem_erro': margens.get(time)}
+             for time, p in dados_web[zona].items()),
+            key=lambda item: item['probabilidade'], reverse=True
+        )
+    
+    times = {}
+    for posicao, linha in enumerate(dados_web['classificacao'], 1):
+        nome = linha['time']
+        times[nome] = {
+            'time': nome,
+            'posicao': posicao,
+            'classificacao': linha,
+            'probabilidades': {zona: round(dados_web[zona].get(nome, 0.0), 2) for zona in ZONAS_WEB},
+            'margens_erro': {zona: dados_web['margens_erro'].get(zona, {}).get(nome) for zona in ZONAS_WEB},
+            'jogos': [],
+            'proximos_jogos': dados_web['proximos_jogos'].get(nome, [])
+        }
+    
+    rodadas = defaultdict(list)
+    for evento in eventos:
+        for nome in (evento['strHomeTeam'], evento['strAwayTeam']):
+            if nome in times:
+                times[nome]['jogos'].append(evento)
+        if evento.get('intRound'):
+            rodadas[str(int(evento['intRound']))].append(evento)
+    
+    return {
+        'serie': serie,
+        'ultima_atualizacao': dados_web['ultima_atualizacao'],
+        'proxima_rodada': dados_web.get('proxima_rodada'),
+        'times': times,
+        'probabilidades': probabilidades,
+        'rodadas': dict(sorted(rodadas.items(), key=lambda item: int(item[0])))
+    }
+
 def processar_dados_web(serie):
     """Processa dados para o site web"""
     log_message(f"Processando dados web da {serie.upper()}...")
     
-    # Carregar dados de simulação
-    with open(f'data/resultados_simulacao_{serie}.json', 'r', encoding='utf-8') as f:
-        simulacao_data = json.load(f)
+    # Carregar dados de simulação (contagens agregadas)
+    simulacao_data = carregar_resultados_simulacao(serie)
+    resumo = resumir_contagens(simulacao_data['times'], simulacao_data['contagem_posicoes'],
+                               simulacao_data['num_simulacoes'])
     
-    # Carregar dados de cache
-    cache_data = carregar_cache(serie)
+    # Carregar dados de cache (uma única passada, reaproveitada abaixo)
+    temporada = carregar_temporada(serie)
     
     # Processar dados
     dados_web = {
@@ -651,75 +2132,383 @@ def processar_dados_web(serie):
     }
     
     # Calcular probabilidades de título
-    if 'posicoes_finais' in simulacao_data:
-        for time, posicoes in simulacao_data['posicoes_finais'].items():
-            if posicoes:
-                primeiro_lugar = sum(1 for pos in posicoes if pos == 1)
-                probabilidade = (primeiro_lugar / len(posicoes)) * 100
-                dados_web['titulo'][time] = round(probabilidade, 1)
+    for time, probabilidade in resumo['titulo'].items():
+        dados_web['titulo'][time] = round(probabilidade, 1)
     
     # Dados de Libertadores/Acesso
-    if 'libertadores' in simulacao_data:
-        dados_web['libertadores'] = simulacao_data['libertadores']
-    
-    if 'acesso_serie_a' in simulacao_data:
-        dados_web['acesso_serie_a'] = simulacao_data['acesso_serie_a']
+    dados_web['libertadores'] = resumo['libertadores']
+    dados_web['acesso_serie_a'] = resumo['acesso_serie_a']
     
     # Dados de Rebaixamento
-    if 'rebaixamento' in simulacao_data:
-        dados_web['rebaixamento'] = simulacao_data['rebaixamento']
+    dados_web['rebaixamento'] = resumo['rebaixamento']
+    
+    # Margens de erro (95%) de cada probabilidade publicada
+    margens = calcular_margens_erro(simulacao_data['times'], simulacao_data['contagem_posicoes'],
+                                    simulacao_data['num_simulacoes'])
+    dados_web['margens_erro'] = {
+        zona: {time: round(margem, 2) for time, margem in por_time.items()}
+        for zona, por_time in margens.items()
+    }
     
     # Classificação
-    dados_web['classificacao'] = calcular_classificacao_real(cache_data, serie)
+    dados_web['classificacao'] = calcular_classificacao_real(temporada, serie)
     
     # Estatísticas
-    total_jogos = 0
-    total_gols = 0
-    
-    for jogos in cache_data.values():
-        if isinstance(jogos, list):
-            for jogo in jogos:
-                if jogo.get('intHomeScore') is not None and jogo.get('intAwayScore') is not None:
-                    total_jogos += 1
-                    gols_casa = int(jogo['intHomeScore'])
-                    gols_fora = int(jogo['intAwayScore'])
-                    total_gols += gols_casa + gols_fora
+    total_jogos = int(temporada.jogado.sum())
+    total_gols = int(temporada.gols_mandante[temporada.jogado].sum() + temporada.gols_visitante[temporada.jogado].sum())
     
     dados_web['estatisticas'] = {
         'total_jogos': total_jogos,
         'media_gols': round(total_gols / total_jogos, 2) if total_jogos > 0 else 0,
-        'simulacoes': 300000
+        'simulacoes': simulacao_data['num_simulacoes']
     }
     
     # Próximos jogos
     try:
         with open(f'data/proximos_jogos_{serie}.json', 'r', encoding='utf-8') as f:
             proximos_data = json.load(f)
+        contar_arquivo(f'data/proximos_jogos_{serie}.json', "bytes_lidos")
         
-        proxima_rodada = encontrar_proxima_rodada(cache_data, serie)
-        dados_web['proximos_jogos'] = proximos_data
+        proxima_rodada = encontrar_proxima_rodada(temporada, serie)
+        dados_web['proximos_jogos'] = {
+            time_nome: [projetar_evento(evento) for evento in eventos]
+            for time_nome, eventos in proximos_data.items()
+        }
         dados_web['proxima_rodada'] = proxima_rodada
         
     except FileNotFoundError:
         dados_web['proximos_jogos'] = {}
         dados_web['proxima_rodada'] = None
     
-    # Salvar dados processados
-    with open(f'data/web_{serie}.json', 'w', encoding='utf-8') as f:
-        json.dump(dados_web, f, ensure_ascii=False, indent=2)
+    # Salvar dados processados (JSON minificado + variantes pré-comprimidas)
+    gravar_artefato_web(dados_web, f'data/web_{serie}.json')
+    
+    # Índices por time, zona e rodada para as rotas fatiadas da API
+    gravar_artefato_web(construir_indices_web(dados_web, serie), f'data/indices_{serie}.json')
     
     log_message(f"Dados web da {serie.upper()} processados!")
     return dados_web
 
+# =============================================================================
+# CACHE DE ESTÁGIOS (HASH DE CONTEÚDO)
+# =============================================================================
+
+def hash_conteudo(*partes):
+    """SHA-256 de valores serializáveis em JSON"""
+    texto = json.dumps(partes, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+def hash_arquivo(caminho):
+    """SHA-256 do conteúdo de um arquivo (None se não existir)"""
+    caminho = Path(caminho)
+    if not caminho.exists():
+        return None
+    conteudo = caminho.read_bytes()
+    contar("bytes_lidos", len(conteudo))
+    return hashlib.sha256(conteudo).hexdigest()
+
+def hash_entrada_estatisticas(temporada):
+    """Hash do conjunto de jogos disputados e dos jogos futuros"""
+    times = temporada.times
+    jogos = [
+        (times[m], times[v], int(gm), int(gv), int(r), bool(jogado))
+        for m, v, gm, gv, r, jogado in zip(temporada.mandante, temporada.visitante, temporada.gols_mandante,
+                                           temporada.gols_visitante, temporada.rodada, temporada.jogado)
+    ]
+    return hash_conteudo(VERSAO_ESTAGIOS, sorted(jogos), sorted(filter(None, temporada.data_texto)))
+
+def carregar_registro_estagios(serie):
+    """Carrega hashes e durações dos estágios já executados de uma série"""
+    arquivo = Path(f"data/estagios_{serie}.json")
+    if arquivo.exists():
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+def gravar_registro_estagio(serie, nome, entrada):
+    """Substitui a entrada de um estágio em data/estagios_{serie}.json"""
+    # Relê o registro: outro estágio da mesma série pode tê-lo atualizado
+    registro = carregar_registro_estagios(serie)
+    registro[nome] = entrada
+    with open(f"data/estagios_{serie}.json", 'w', encoding='utf-8') as f:
+        json.dump(registro, f, ensure_ascii=False, indent=2)
+
+def executar_estagio(nome, serie, hash_entrada, artefatos, funcao, relatorio, forcar=False):
+    """Executa um estágio só se o hash das entradas mudou ou algum artefato sumiu
+    
+    Registra em `relatorio` se o estágio foi reutilizado e quanto tempo isso poupou
+    (duração da última execução real) ou, se executado, as métricas de medir_estagio.
+    """
+    registro = carregar_registro_estagios(serie)
+    anterior = registro.get(nome)
+    
+    if (not forcar and anterior and anterior.get('hash') == hash_entrada
+            and all(Path(artefato).exists() for artefato in artefatos)):
+        log_message(f"  [CACHE] {nome} da {serie.upper()} reutilizado (entradas inalteradas)")
+        relatorio.append({'estagio': nome, 'serie': serie, 'reutilizado': True,
+                          'tempo_economizado': anterior.get('duracao', 0.0)})
+        return False
+    
+    with medir_estagio(nome, serie, relatorio, entrada_registro={'hash': hash_entrada}):
+        funcao()
+    return True
+
+def executar_estagios_analise(serie, relatorio, num_simulacoes=NUM_SIMULACOES, seed=None,
+                              workers=WORKERS_SIMULACAO, guardar_cenarios=False,
+                              tolerancia=TOLERANCIA_SIMULACAO, forcar=False):
+    """Estágios de estatísticas e simulação de uma série, com cache por hash"""
+    temporada = carregar_temporada(serie)
+    arquivo_estatisticas = f'data/estatisticas_{serie}.json'
+    executar_estagio(
+        'estatisticas', serie, hash_entrada_estatisticas(temporada), [arquivo_estatisticas],
+        lambda: executar_estatisticas(serie, temporada), relatorio, forcar
+    )
+    
+    artefatos_simulacao = [f'data/resultados_simulacao_{serie}.npz']
+    if guardar_cenarios:
+        artefatos_simulacao += [f'data/cenarios_{serie}.npz', f'data/alavancagem_{serie}.json']
+    hash_simulacao = hash_conteudo(
+        VERSAO_ESTAGIOS, hash_arquivo(arquivo_estatisticas), MOTOR_SIMULACAO, num_simulacoes,
+        seed, workers, guardar_cenarios, tolerancia, LOTE_ADAPTATIVO if tolerancia is not None else None
+    )
+    executar_estagio(
+        'simulacao', serie, hash_simulacao, artefatos_simulacao,
+        lambda: executar_simulacao(serie, num_simulacoes, seed=seed, workers=workers,
+                                   guardar_cenarios=guardar_cenarios, tolerancia=tolerancia,
+                                   estatisticas=carregar_estatisticas(serie)),
+        relatorio, forcar
+    )
+
+def executar_estagio_web(serie, relatorio, forcar=False):
+    """Estágio de processamento web de uma série, com cache por hash"""
+    hash_web = hash_conteudo(
+        VERSAO_ESTAGIOS,
+        hash_arquivo(f'data/resultados_simulacao_{serie}.npz'),
+        hash_arquivo(f'data/cache_jogos_{serie}.json'),
+        hash_arquivo(f'data/proximos_jogos_{serie}.json')
+    )
+    artefatos = [f'data/web_{serie}.json', f'data/web_{serie}.json.gz', f'data/indices_{serie}.json']
+    if not executar_estagio('web', serie, hash_web, artefatos,
+                            lambda: processar_dados_web(serie), relatorio, forcar):
+        renovar_atualizacao_web(serie)
+
+def renovar_atualizacao_web(serie):
+    """Estágio web reutilizado: as entradas foram conferidas agora, então ultima_atualizacao avança
+    
+    Sem isso o site mostraria a data da última reconstrução e a API calcularia o
+    s-maxage a partir dela. Só o campo muda; o restante dos artefatos é mantido.
+    """
+    agora = datetime.now().isoformat()
+    for caminho in (f'data/web_{serie}.json', f'data/indices_{serie}.json'):
+        with open(caminho, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+        contar_arquivo(caminho, "bytes_lidos")
+        dados['ultima_atualizacao'] = agora
+        gravar_artefato_web(dados, caminho)
+
+def resumir_relatorio_estagios(relatorio):
+    """Loga as métricas dos estágios executados e quais foram reutilizados (com o tempo poupado)"""
+    executados = [item for item in relatorio if not item['reutilizado']]
+    if executados:
+        log_message(f"{'Estágio':<28} {'parede':>8} {'CPU':>8} {'pico RSS':>10} {'HTTP':>5} "
+                    f"{'cache':>6} {'espera':>7} {'lidos':>9} {'gravados':>9}")
+    for item in executados:
+        pico = f"{item['pico_rss_mb']:.0f} MB" if item['pico_rss_mb'] is not None else "-"
+        log_message(f"{item['estagio'] + ' (' + item['serie'] + ')':<28} {item['duracao']:7.1f}s {item['cpu']:7.1f}s "
+                    f"{pico:>10} {item['requisicoes_http']:>5} {item['acertos_cache_http']:>6} "
+                    f"{item['espera_limite_taxa']:6.1f}s {item['bytes_lidos'] // 1024:>6} KB "
+                    f"{item['bytes_gravados'] // 1024:>6} KB")
+    
+    reutilizados = [item for item in relatorio if item['reutilizado']]
+    economia = sum(item['tempo_economizado'] for item in reutilizados)
+    log_message(f"Estágios reutilizados: {len(reutilizados)}/{len(relatorio)} "
+                f"(economia estimada de {economia:.1f}s)")
+    for item in reutilizados:
+        log_message(f"  - {item['estagio']} ({item['serie']}): {item['tempo_economizado']:.1f}s")
+
 # =============================================================================
 # FUNÇÃO PRINCIPAL
 # =============================================================================
 
-def executar_sistema_completo():
-    """Executa todo o sistema unificado"""
+ETAPAS_PIPELINE = ("fetch", "simulate", "web")
+NOMES_SERIES = {"serie_a": "SÉRIE A", "serie_b": "SÉRIE B"}
+
+def interpretar_etapas(texto):
+    """Converte "fetch,web" em tupla de etapas na ordem do pipeline (tipo de argumento da CLI)"""
+    pedidas = {etapa.strip().lower() for etapa in texto.split(",") if etapa.strip()}
+    invalidas = pedidas - set(ETAPAS_PIPELINE)
+    if invalidas:
+        raise argparse.ArgumentTypeError(f"etapas desconhecidas: {', '.join(sorted(invalidas))} "
+                         f"(válidas: {', '.join(ETAPAS_PIPELINE)})")
+    return tuple(etapa for etapa in ETAPAS_PIPELINE if etapa in pedidas)
+
+def interpretar_series(texto):
+    """Converte "a", "b", "serie_a", "serie-b" ou "ambas" em tupla de séries"""
+    texto = (texto or "ambas").strip().lower().replace("-", "_")
+    if texto in ("ambas", "todas", "all", "ab"):
+        return tuple(NOMES_SERIES)
+    serie = texto if texto.startswith("serie_") else f"serie_{texto}"
+    if serie not in NOMES_SERIES:
+        raise argparse.ArgumentTypeError(f"série desconhecida: {texto} (use a, b ou ambas)")
+    return (serie,)
+
+def executar_pipeline(etapas=ETAPAS_PIPELINE, series=tuple(NOMES_SERIES), num_simulacoes=NUM_SIMULACOES,
+                      seed=None, workers=WORKERS_SIMULACAO, guardar_cenarios=False,
+                      tolerancia=TOLERANCIA_SIMULACAO, forcar=False, buscar_faltantes=True):
+    """Executa só as etapas e séries pedidas; as demais reaproveitam os artefatos já em data/
+    
+    fetch: jogos, jogos faltantes e próximos jogos; simulate: estatísticas e
+    simulação; web: artefatos do site. Devolve as métricas de cada estágio
+    (medir_estagio). Exceções sobem para quem chamou.
+    """
+    passo = 0
+    def cabecalho(titulo):
+        nonlocal passo
+        passo += 1
+        log_message(f"\n{passo}. {titulo}")
+        log_message("-" * 40)
+    
+    # Migração única do cache antigo (listas por confronto) para o índice por idEvent
+    preparar_series(series)
+    
+    relatorio_estagios = []
+    if "fetch" in etapas:
+        for serie in series:
+            cabecalho(f"BUSCANDO JOGOS DA {NOMES_SERIES[serie]}")
+            with medir_estagio('busca_jogos', serie, relatorio_estagios, entrada_registro={}):
+                buscar_jogos(serie)
+        
+        if buscar_faltantes:
+            cabecalho("BUSCANDO JOGOS FALTANTES")
+            for serie in series:
+                with medir_estagio('busca_faltantes', serie, relatorio_estagios, entrada_registro={}):
+                    buscar_jogos_faltantes(serie)
+        if BACKEND_CACHE == "sqlite":
+            # O site estático continua lendo o cache em JSON
+            for serie in series:
+                with medir_estagio('exportacao_json', serie, relatorio_estagios, entrada_registro={}):
+                    exportar_cache_json(serie)
+        
+        cabecalho("BUSCANDO PRÓXIMOS JOGOS")
+        for serie in series:
+            with medir_estagio('busca_proximos', serie, relatorio_estagios, entrada_registro={}):
+                buscar_proximos_jogos(serie)
+    
+    if "simulate" in etapas:
+        cabecalho("EXECUTANDO SIMULAÇÕES")
+        for serie in series:
+            executar_estagios_analise(serie, relatorio_estagios, num_simulacoes, seed=seed, workers=workers,
+                                      guardar_cenarios=guardar_cenarios, tolerancia=tolerancia, forcar=forcar)
+    
+    if "web" in etapas:
+        cabecalho("PROCESSANDO DADOS PARA WEB")
+        for serie in series:
+            executar_estagio_web(serie, relatorio_estagios, forcar)
+    
+    if relatorio_estagios:
+        resumir_relatorio_estagios(relatorio_estagios)
+    return relatorio_estagios
+
+def preparar_series(series):
+    """Migração única do cache antigo e, com SQLite, carga inicial do banco"""
+    for serie in series:
+        migrar_cache_arquivo(serie)
+        if BACKEND_CACHE == "sqlite":
+            importar_cache_json(serie)
+
+def buscar_dados_serie(serie, relatorio, buscar_faltantes=True):
+    """Etapa fetch de uma série: jogos, jogos faltantes e próximos jogos (cada um medido como estágio)"""
+    with medir_estagio('busca_jogos', serie, relatorio, entrada_registro={}):
+        buscar_jogos(serie)
+    if buscar_faltantes:
+        with medir_estagio('busca_faltantes', serie, relatorio, entrada_registro={}):
+            buscar_jogos_faltantes(serie)
+    if BACKEND_CACHE == "sqlite":
+        with medir_estagio('exportacao_json', serie, relatorio, entrada_registro={}):
+            exportar_cache_json(serie)
+    with medir_estagio('busca_proximos', serie, relatorio, entrada_registro={}):
+        buscar_proximos_jogos(serie)
+
+def simular_serie_processo(serie, backend, perfilar, opcoes):
+    """Etapa simulate de uma série num processo separado; devolve o relatório dos estágios"""
+    definir_backend_cache(backend)
+    definir_perfilamento(perfilar)
+    relatorio = []
+    executar_estagios_analise(serie, relatorio, **opcoes)
+    return relatorio
+
+def executar_cadeia_serie(serie, etapas, pool_simulacao, opcoes, buscar_faltantes=True):
+    """fetch -> simulate -> web de uma série; só a simulação sai desta thread (vai para um processo)"""
+    relatorio = []
+    inicio = time.perf_counter()
+    if "fetch" in etapas:
+        buscar_dados_serie(serie, relatorio, buscar_faltantes)
+    if "simulate" in etapas:
+        relatorio += pool_simulacao.submit(simular_serie_processo, serie, BACKEND_CACHE, PERFILAR_ESTAGIOS,
+                                           opcoes).result()
+    if "web" in etapas:
+        executar_estagio_web(serie, relatorio, opcoes['forcar'])
+    log_message(f"{NOMES_SERIES[serie]} concluída em {time.perf_counter() - inicio:.1f}s")
+    return relatorio
+
+def executar_pipeline_concorrente(etapas=ETAPAS_PIPELINE, series=tuple(NOMES_SERIES), num_simulacoes=NUM_SIMULACOES,
+                                  seed=None, workers=WORKERS_SIMULACAO, guardar_cenarios=False,
+                                  tolerancia=TOLERANCIA_SIMULACAO, forcar=False, buscar_faltantes=True):
+    """Mesmo trabalho de executar_pipeline, com as séries em paralelo
+    
+    Cada série segue sua cadeia fetch -> simulate -> web numa thread; a simulação
+    roda num processo, então a busca (rede) de uma série se sobrepõe à simulação
+    (CPU) da outra e o tempo total tende ao da série mais lenta. A cota da API é
+    global (LimitadorTaxa) e o registro de estágios é por série, sem disputa.
+    """
+    preparar_series(series)
+    opcoes = {'num_simulacoes': num_simulacoes, 'seed': seed, 'workers': workers,
+              'guardar_cenarios': guardar_cenarios, 'tolerancia': tolerancia, 'forcar': forcar}
+    
+    inicio = time.perf_counter()
+    log_message(f"Executando {', '.join(NOMES_SERIES[s] for s in series)} em paralelo ({', '.join(etapas)})")
+    with ProcessPoolExecutor(max_workers=len(series), mp_context=contexto_processos()) as pool_simulacao, \
+            ThreadPoolExecutor(max_workers=len(series)) as pool_series:
+        cadeias = [pool_series.submit(executar_cadeia_serie, serie, etapas, pool_simulacao, opcoes, buscar_faltantes)
+                   for serie in series]
+        relatorio_estagios = [item for cadeia in cadeias for item in cadeia.result()]
+    
+    if relatorio_estagios:
+        resumir_relatorio_estagios(relatorio_estagios)
+    log_message(f"Pipeline concluído em {time.perf_counter() - inicio:.1f}s")
+    return relatorio_estagios
+
+def executar_atualizacao_serie(serie, num_simulacoes=NUM_SIMULACOES, seed=None, workers=WORKERS_SIMULACAO,
+                               guardar_cenarios=False, tolerancia=TOLERANCIA_SIMULACAO, forcar=False, relatorio=None):
+    """Atualização de uma única série (ex.: logo após o fim de um jogo): jogos, próximos jogos, análise e web
+    
+    Com `relatorio` (lista), as métricas dos estágios são acrescentadas nela.
+    """
+    log_message(f"ATUALIZAÇÃO DA {serie.upper()}")
+    try:
+        estagios = executar_pipeline(ETAPAS_PIPELINE, (serie,), num_simulacoes, seed=seed, workers=workers,
+                                     guardar_cenarios=guardar_cenarios, tolerancia=tolerancia, forcar=forcar,
+                                     buscar_faltantes=False)
+        if relatorio is not None:
+            relatorio.extend(estagios)
+        return True
+    except Exception as e:
+        log_message(f"ERRO durante atualização da {serie.upper()}: {e}")
+        return False
+
+def executar_sistema_completo(num_simulacoes=NUM_SIMULACOES, seed=None, workers=WORKERS_SIMULACAO,
+                              guardar_cenarios=False, tolerancia=TOLERANCIA_SIMULACAO, forcar=False,
+                              etapas=ETAPAS_PIPELINE, series=tuple(NOMES_SERIES), concorrente=PIPELINE_CONCORRENTE,
+                              relatorio=None):
+    """Executa o sistema unificado (por padrão todas as etapas para as duas séries)
+    
+    Com `relatorio` (lista), as métricas dos estágios são acrescentadas nela.
+    """
     log_message("=" * 80)
     log_message("SISTEMA COMPLETO UNIFICADO - CAMPEONATO BRASILEIRO 2025")
     log_message("=" * 80)
+    if tuple(etapas) != ETAPAS_PIPELINE or tuple(series) != tuple(NOMES_SERIES):
+        log_message(f"Etapas: {', '.join(etapas)} | Séries: {', '.join(NOMES_SERIES[s] for s in series)}")
     
     # Verificar se estamos no diretório correto
     if not Path("data").exists():
@@ -727,56 +2516,25 @@ def executar_sistema_completo():
         log_message("Execute este script na raiz do projeto.")
         return False
     
-    # Criar diretório data se não existir
-    Path("data").mkdir(exist_ok=True)
-    
     try:
-        # 1. Buscar jogos da Série A
-        log_message("\n1. BUSCANDO JOGOS DA SÉRIE A")
-        log_message("-" * 40)
-        cache_serie_a = buscar_jogos_serie("serie_a")
-        
-        # 2. Buscar jogos da Série B
-        log_message("\n2. BUSCANDO JOGOS DA SÉRIE B")
-        log_message("-" * 40)
-        cache_serie_b = buscar_jogos_serie("serie_b")
-        
-        # 3. Buscar jogos faltantes
-        log_message("\n3. BUSCANDO JOGOS FALTANTES")
-        log_message("-" * 40)
-        buscar_jogos_faltantes("serie_a")
-        buscar_jogos_faltantes("serie_b")
-        
-        # 4. Buscar próximos jogos
-        log_message("\n4. BUSCANDO PRÓXIMOS JOGOS")
-        log_message("-" * 40)
-        buscar_proximos_jogos("serie_a")
-        buscar_proximos_jogos("serie_b")
-        
-        # 5. Executar simulações
-        log_message("\n5. EXECUTANDO SIMULAÇÕES")
-        log_message("-" * 40)
-        executar_simulacao("serie_a")
-        executar_simulacao("serie_b")
-        
-        # 6. Processar dados para web
-        log_message("\n6. PROCESSANDO DADOS PARA WEB")
-        log_message("-" * 40)
-        processar_dados_web("serie_a")
-        processar_dados_web("serie_b")
+        pipeline = executar_pipeline_concorrente if concorrente and len(series) > 1 else executar_pipeline
+        estagios = pipeline(etapas, series, num_simulacoes, seed=seed, workers=workers,
+                            guardar_cenarios=guardar_cenarios, tolerancia=tolerancia, forcar=forcar)
+        if relatorio is not None:
+            relatorio.extend(estagios)
         
         log_message("\n" + "=" * 80)
         log_message("SISTEMA COMPLETO EXECUTADO COM SUCESSO!")
         log_message("=" * 80)
         log_message("Arquivos gerados:")
-        log_message("- data/cache_jogos_serie_a.json")
-        log_message("- data/cache_jogos_serie_b.json")
-        log_message("- data/proximos_jogos_serie_a.json")
-        log_message("- data/proximos_jogos_serie_b.json")
-        log_message("- data/resultados_simulacao_serie_a.json")
-        log_message("- data/resultados_simulacao_serie_b.json")
-        log_message("- data/web_serie_a.json")
-        log_message("- data/web_serie_b.json")
+        for serie in series:
+            if "fetch" in etapas:
+                log_message(f"- data/cache_jogos_{serie}.json")
+                log_message(f"- data/proximos_jogos_{serie}.json")
+            if "simulate" in etapas:
+                log_message(f"- data/resultados_simulacao_{serie}.npz")
+            if "web" in etapas:
+                log_message(f"- data/web_{serie}.json")
         log_message("=" * 80)
         
         return True
@@ -791,8 +2549,41 @@ def main():
     print("Este script executa toda a análise em um arquivo único")
     print()
     
+    parser = argparse.ArgumentParser(description="Sistema Completo Unificado - Campeonato Brasileiro 2025")
+    parser.add_argument("--sims", type=int, default=NUM_SIMULACOES,
+                        help="número de simulações por série (teto no modo adaptativo)")
+    parser.add_argument("--seed", type=int, default=None, help="semente raiz para resultados reprodutíveis")
+    parser.add_argument("--workers", type=int, default=WORKERS_SIMULACAO,
+                        help="processos da simulação (0 = todos os núcleos)")
+    parser.add_argument("--cenarios", action="store_true",
+                        help="guarda resultados por simulação para consultas 'e se?' e alavancagem")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA_SIMULACAO,
+                        help="margem de erro alvo em p.p.; ativa o modo adaptativo")
+    parser.add_argument("--forcar", action="store_true",
+                        help="executa todos os estágios mesmo com entradas inalteradas")
+    parser.add_argument("--replay", action="store_true",
+                        help="usa apenas respostas gravadas em data/cache_http (sem rede)")
+    parser.add_argument("--backend", choices=["json", "sqlite"], default=BACKEND_CACHE,
+                        help="armazenamento dos eventos (sqlite grava data/eventos.db e exporta o JSON)")
+    parser.add_argument("--stages", type=interpretar_etapas, default=ETAPAS_PIPELINE,
+                        help="etapas a executar, separadas por vírgula: fetch,simulate,web (padrão: todas)")
+    parser.add_argument("--serie", type=interpretar_series, default=tuple(NOMES_SERIES),
+                        help="série a processar: a, b ou ambas (padrão: ambas)")
+    parser.add_argument("--sequencial", action="store_true",
+                        help="processa uma série depois da outra (sem paralelismo entre séries)")
+    parser.add_argument("--profile", action="store_true",
+                        help="grava um perfil cProfile (.pstats) por estágio em data/perfis/")
+    args = parser.parse_args()
+    if args.replay:
+        definir_modo_replay(True)
+    definir_backend_cache(args.backend)
+    definir_perfilamento(args.profile)
+    
     try:
-        sucesso = executar_sistema_completo()
+        sucesso = executar_sistema_completo(args.sims, seed=args.seed, workers=args.workers,
+                                            guardar_cenarios=args.cenarios, tolerancia=args.tolerancia,
+                                            forcar=args.forcar, etapas=args.stages, series=args.serie,
+                                            concorrente=not args.sequencial)
         if sucesso:
             print("\n✅ Execução concluída com sucesso!")
             print("📊 Dados processados e salvos na pasta 'data/'")